@@ -1,3 +1,349 @@
+import queue
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Viewport:
+    """
+    The part of the universe a frame shows: `width` x `height` pixels whose
+    bottom-left one starts at cell (xmin, ymin), each covering `block` x
+    `block` cells.
+    """
+    xmin: int
+    ymin: int
+    width: int
+    height: int
+    block: int = 1
+
+    @classmethod
+    def centered(cls, width, height):
+        return cls(-(width // 2), -(height // 2), width, height)
+
+
+# Largest frame side, in pixels, of an "auto" viewport when the caller gives
+# no `max_size`; a wider bounding box is density-downsampled rather than
+# drawn cell for cell.
+DEFAULT_MAX_SIZE = 1024
+
+
+def _fit(xmin, ymin, cols, rows, max_size):
+    # Smallest power-of-two block that fits cols x rows cells into
+    # max_size pixels per side; blocks of one level tile the next exactly.
+    block = 1
+    if max_size is not None:
+        while max(cols, rows) > block * max_size:
+            block *= 2
+    return Viewport(int(xmin), int(ymin), -(-cols // block), -(-rows // block), block)
+
+
+def resolve_viewport(life, viewport=None, width=100, height=100, max_size=None, margin=8):
+    """
+    The Viewport of a render. `viewport` is None for the `width` x `height`
+    window centred on the origin, "auto" to frame the current bounding box
+    of `life` plus `margin` cells (the centred window if it is empty), an
+    (xmin, xmax, ymin, ymax) box, or a Viewport used as is. A window wider
+    or taller than `max_size` pixels is downsampled by a power-of-two block
+    so frames never exceed it. Explicit sizes are honoured unless
+    `max_size` is given; an "auto" window, whose size follows the pattern,
+    is capped at DEFAULT_MAX_SIZE by default.
+    """
+    if max_size is not None and max_size < 1:
+        raise ValueError("max_size must be at least 1")
+    if isinstance(viewport, Viewport):
+        return viewport
+    if viewport == "auto":
+        if max_size is None:
+            max_size = DEFAULT_MAX_SIZE
+        box = life.bounding_box()
+        if box is None:
+            viewport = None
+        else:
+            xmin, xmax, ymin, ymax = box
+            viewport = (xmin - margin, xmax + margin, ymin - margin, ymax + margin)
+    if viewport is None:
+        centre = Viewport.centered(width, height)
+        return _fit(centre.xmin, centre.ymin, width, height, max_size)
+    xmin, xmax, ymin, ymax = viewport
+    return _fit(xmin, ymin, xmax - xmin + 1, ymax - ymin + 1, max_size)
+
+
+class FrameBuilder:
+    """
+    Turn a Life universe into (height, width, 3) uint8 RGB frames.
+
+    By default world cell (x, y) lands at row y + height // 2, column
+    x + width // 2 (row 0 is drawn at the bottom); a `viewport` replaces
+    that window and the frame size. Live cells are scattered in with one
+    fancy-indexed write from `life.coords()`. When the viewport packs
+    several cells into a pixel the frame is a population-density image
+    instead: cells are block-summed with one bincount and a pixel's
+    brightness is the square root of its live fraction, so sparse blocks
+    stay visible. The optional fading stream
+    trail is kept in a float32 buffer, the highlight regions are composed
+    once into a static layer, and every frame is written into the same
+    reused `frame` buffer. With `frame_stride` > 1 consecutive frames are
+    that many generations apart and the trail fades by
+    `stream_decay ** frame_stride` between them, so it lasts as many
+    generations as in a full-rate render.
+    """
+
+    def __init__(
+        self,
+        width,
+        height,
+        show_stream=False,
+        stream_decay=0.93,
+        stream_intensity=0.35,
+        highlight_regions=None,
+        frame_stride=1,
+        viewport=None,
+    ):
+        self.viewport = viewport or Viewport.centered(width, height)
+        self.width = self.viewport.width
+        self.height = self.viewport.height
+        self.block = self.viewport.block
+        self.x_offset = -self.viewport.xmin
+        self.y_offset = -self.viewport.ymin
+        self.show_stream = show_stream
+        self.stream_decay = stream_decay ** frame_stride
+        self.stream_intensity = stream_intensity
+        shape = (self.height, self.width)
+        self.live = np.zeros(shape, dtype=bool if self.block == 1 else np.float32)
+        self.trail = np.zeros(shape, dtype=np.float32)
+        self.frame = np.zeros(shape + (3,), dtype=np.uint8)
+        self.background = self._highlight_layer(highlight_regions or [])
+
+    def _highlight_layer(self, regions):
+        layer = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        for region in regions:
+            xmin = (int(region["xmin"]) + self.x_offset) // self.block
+            xmax = (int(region["xmax"]) + self.x_offset) // self.block
+            ymin = (int(region["ymin"]) + self.y_offset) // self.block
+            ymax = (int(region["ymax"]) + self.y_offset) // self.block
+            alpha = float(region.get("alpha", 0.18))
+            color = region.get("color", (0.0, 0.8, 0.0))
+
+            x0 = max(0, min(self.width - 1, xmin))
+            x1 = max(0, min(self.width - 1, xmax))
+            y0 = max(0, min(self.height - 1, ymin))
+            y1 = max(0, min(self.height - 1, ymax))
+            if x0 > x1 or y0 > y1:
+                continue
+
+            rgb = np.round(np.asarray(color, dtype=float) * alpha * 255).astype(np.uint8)
+            window = layer[y0 : y1 + 1, x0 : x1 + 1]
+            np.maximum(window, rgb, out=window)
+        return layer
+
+    def _scatter(self, coords):
+        block = self.block
+        gx = coords[:, 0] + self.x_offset
+        gy = coords[:, 1] + self.y_offset
+        if block > 1:
+            gx = gx // block
+            gy = gy // block
+        inside = (gx >= 0) & (gx < self.width) & (gy >= 0) & (gy < self.height)
+        if block == 1:
+            self.live.fill(False)
+            self.live[gy[inside], gx[inside]] = True
+            return
+        counts = np.bincount(
+            gy[inside] * self.width + gx[inside], minlength=self.width * self.height
+        )
+        np.sqrt(counts.reshape(self.live.shape) / (block * block), out=self.live)
+
+    def build(self, life):
+        return self.build_coords(life.coords())
+
+    def build_coords(self, coords):
+        self._scatter(coords)
+        frame = self.frame
+        if self.show_stream:
+            self.trail *= self.stream_decay
+            np.maximum(self.trail, self.live, out=self.trail)
+            stream = np.minimum(self.trail * (self.stream_intensity * 255), 255).astype(np.uint8)
+            np.maximum(self.background, stream[:, :, None], out=frame)
+        else:
+            frame[:] = self.background
+        if self.block == 1:
+            frame[self.live] = 255
+        else:
+            np.maximum(frame, (self.live * 255).astype(np.uint8)[:, :, None], out=frame)
+        return frame
+
+
+_DONE = object()
+
+
+def _fast_forward(life, n, step_callback=None, t=0):
+    # Move `n` generations on: through Life.advance (HashLife jumps, known
+    # cycles are skipped) unless a callback must see every generation,
+    # numbered from `t`.
+    if n <= 0:
+        return
+    if step_callback is None:
+        if n == 1:
+            life.step()
+        else:
+            life.advance(n)
+        return
+    for i in range(t, t + n):
+        step_callback(life, i)
+        life.step()
+
+
+def _skip_to_start(life, start_at, step_callback):
+    # Fast-forward to the first rendered generation; returns the callback
+    # with its generation numbers shifted to match.
+    if start_at < 0:
+        raise ValueError("start_at must be non-negative")
+    _fast_forward(life, start_at, step_callback)
+    if step_callback is None or start_at == 0:
+        return step_callback
+    return lambda life, t: step_callback(life, t + start_at)
+
+
+def _grid_pixels(show_grid, grid_spacing, viewport):
+    # Grid spacing in frame pixels, or None once lines would be under two
+    # pixels apart.
+    if not show_grid:
+        return None
+    if viewport.block == 1:
+        return grid_spacing
+    spacing = grid_spacing // viewport.block
+    return spacing if spacing >= 2 else None
+
+
+def _frame_coords(life, steps, step_callback, frame_stride):
+    # Live cells of every rendered generation: 0, frame_stride, ... below
+    # `steps`. `life` ends `steps` generations on either way.
+    if frame_stride < 1:
+        raise ValueError("frame_stride must be at least 1")
+    t = 0
+    end = steps
+    while t < end:
+        if step_callback is not None:
+            step_callback(life, t)
+        yield life.coords()
+        n = min(frame_stride, end - t)
+        if step_callback is None:
+            _fast_forward(life, n)
+        else:
+            life.step()
+            _fast_forward(life, n - 1, step_callback, t + 1)
+        t += n
+
+
+def run_pipeline(
+    life,
+    steps,
+    rasterize,
+    consume,
+    step_callback=None,
+    queue_size=8,
+    threaded=True,
+    frame_stride=1,
+):
+    """
+    Simulate `steps` generations, rasterize each one and consume the result.
+
+    The stages are: call `step_callback(life, t)`, snapshot `life.coords()`,
+    step; `rasterize(coords)` into a frame; `consume(frame)` (drawing and
+    encoding). With `threaded` the first two run in worker threads joined
+    by bounded queues of `queue_size` items, so the slowest stage sets the
+    pace and at most about 2 * queue_size snapshots and frames are alive at
+    once; `consume` stays on the calling thread (matplotlib is not thread
+    safe). `rasterize` must return a frame it will not modify later. The
+    first exception from any stage stops the others and is re-raised.
+
+    A `step_callback` always runs on the calling thread, before the frame
+    of its generation is drawn: with one, the stages run one after another
+    and `threaded` is ignored, so callbacks may touch `life`, matplotlib or
+    caller state without locking.
+
+    For a time-lapse only every `frame_stride`-th generation is rendered.
+    Without a `step_callback` the skipped generations go through
+    `Life.advance`; with one, every generation is still stepped so the
+    callback sees them all.
+    """
+    coords_iter = _frame_coords(life, steps, step_callback, frame_stride)
+    if not threaded or step_callback is not None:
+        for coords in coords_iter:
+            consume(rasterize(coords))
+        return
+
+    snapshots = queue.Queue(queue_size)
+    frames = queue.Queue(queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(q):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return _DONE
+
+    def simulate():
+        try:
+            for coords in coords_iter:
+                if not put(snapshots, coords):
+                    return
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            put(snapshots, _DONE)
+
+    def render():
+        try:
+            while True:
+                coords = get(snapshots)
+                if coords is _DONE:
+                    break
+                if not put(frames, rasterize(coords)):
+                    return
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            put(frames, _DONE)
+
+    workers = [
+        threading.Thread(target=simulate, name="life-simulate", daemon=True),
+        threading.Thread(target=render, name="life-rasterize", daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        while True:
+            frame = get(frames)
+            if frame is _DONE:
+                break
+            consume(frame)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for worker in workers:
+            worker.join()
+    if errors:
+        raise errors[0]
+
+
 def animate_life(
     life,
     steps=200,
@@ -14,8 +360,22 @@ def animate_life(
     grid_color="#7a7a7a",
     highlight_regions=None,
     step_callback=None,
+    pipeline=True,
+    frame_stride=1,
+    start_at=0,
+    viewport=None,
+    max_size=None,
 ):
-    import numpy as np
+    """
+    Render `steps` generations of `life` with matplotlib to `save` (.mp4
+    through ffmpeg, .gif through Pillow, or a still .png/.jpg of generation
+    `start_at`). For a time-lapse `start_at` generations are skipped
+    before the first frame and `frame_stride` renders every n-th one.
+    `pipeline` simulates and rasterizes in worker threads; `step_callback`
+    still runs on the calling thread, see `run_pipeline`. `viewport` and
+    `max_size` choose the window, see `resolve_viewport`; "auto" frames the
+    universe as it is at `start_at`.
+    """
     import matplotlib.pyplot as plt
     import matplotlib.animation as animation
     from pathlib import Path
@@ -23,107 +383,359 @@ def animate_life(
     target = Path(save)
     target.parent.mkdir(parents=True, exist_ok=True)
 
-    x_offset = width // 2
-    y_offset = height // 2
+    step_callback = _skip_to_start(life, start_at, step_callback)
+    view = resolve_viewport(life, viewport, width, height, max_size)
+    width, height = view.width, view.height
+    grid_spacing = _grid_pixels(show_grid, grid_spacing, view)
 
     fig, ax = plt.subplots()
-    trail = np.zeros((height, width), dtype=float)
-    highlight_regions = highlight_regions or []
+    frames = FrameBuilder(
+        width,
+        height,
+        show_stream=show_stream,
+        stream_decay=stream_decay,
+        stream_intensity=stream_intensity,
+        highlight_regions=highlight_regions,
+        frame_stride=frame_stride,
+        viewport=view,
+    )
+
+    # One AxesImage for the whole run; frames only swap its data.
+    image = ax.imshow(frames.frame, origin="lower", interpolation="nearest")
+    ax.set_xlim(-0.5, width - 0.5)
+    ax.set_ylim(-0.5, height - 0.5)
+    if grid_spacing is not None:
+        ax.set_xticks(np.arange(0, width, grid_spacing))
+        ax.set_yticks(np.arange(0, height, grid_spacing))
+        ax.grid(True, color=grid_color, alpha=grid_alpha, linewidth=0.3)
+    else:
+        ax.set_xticks([])
+        ax.set_yticks([])
+    ax.set_facecolor("black")
+
+    suffix = target.suffix.lower()
+    if suffix in {".png", ".jpg", ".jpeg"}:
+        if step_callback is not None:
+            step_callback(life, 0)
+        image.set_data(frames.build(life))
+        fig.savefig(target, dpi=200, bbox_inches="tight")
+        plt.close(fig)
+        return
 
-    def _build_frame():
-        live_grid = np.zeros((height, width), dtype=float)
+    base_fps = 20
+    fps = max(1, int(round(base_fps * float(speed))))
+    if suffix == ".gif":
+        writer = animation.PillowWriter(fps=fps)
+    else:
+        writer = animation.FFMpegWriter(fps=fps)
 
-        for x, y in life.alive:
-            gx = x + x_offset
-            gy = y + y_offset
-            if 0 <= gx < width and 0 <= gy < height:
-                live_grid[gy, gx] = 1.0
+    def _grab(frame):
+        image.set_data(frame)
+        writer.grab_frame()
 
-        if show_stream:
-            trail[:] *= stream_decay
-            trail[:] = np.maximum(trail, live_grid)
-        else:
-            trail.fill(0.0)
-
-        frame = np.zeros((height, width, 3), dtype=float)
-        if show_stream:
-            stream_layer = np.clip(trail * stream_intensity, 0.0, 1.0)
-            frame[:, :, 0] = stream_layer
-            frame[:, :, 1] = stream_layer
-            frame[:, :, 2] = stream_layer
-
-        for region in highlight_regions:
-            xmin = int(region["xmin"]) + x_offset
-            xmax = int(region["xmax"]) + x_offset
-            ymin = int(region["ymin"]) + y_offset
-            ymax = int(region["ymax"]) + y_offset
-            alpha = float(region.get("alpha", 0.18))
-            color = region.get("color", (0.0, 0.8, 0.0))
-            r, g, b = color
+    with writer.saving(fig, str(target), dpi=200):
+        run_pipeline(
+            life,
+            steps,
+            rasterize=lambda coords: frames.build_coords(coords).copy(),
+            consume=_grab,
+            step_callback=step_callback,
+            threaded=pipeline,
+            frame_stride=frame_stride,
+        )
 
-            x0 = max(0, min(width - 1, xmin))
-            x1 = max(0, min(width - 1, xmax))
-            y0 = max(0, min(height - 1, ymin))
-            y1 = max(0, min(height - 1, ymax))
-            if x0 > x1 or y0 > y1:
-                continue
+    plt.close(fig)
 
-            frame[y0 : y1 + 1, x0 : x1 + 1, 0] = np.maximum(
-                frame[y0 : y1 + 1, x0 : x1 + 1, 0], r * alpha
-            )
-            frame[y0 : y1 + 1, x0 : x1 + 1, 1] = np.maximum(
-                frame[y0 : y1 + 1, x0 : x1 + 1, 1], g * alpha
-            )
-            frame[y0 : y1 + 1, x0 : x1 + 1, 2] = np.maximum(
-                frame[y0 : y1 + 1, x0 : x1 + 1, 2], b * alpha
-            )
 
-        live_mask = live_grid > 0
-        frame[live_mask] = (1.0, 1.0, 1.0)
-        return frame
+def _hex_rgb(color):
+    color = color.lstrip("#")
+    return np.array([int(color[i : i + 2], 16) for i in (0, 2, 4)], dtype=np.float32)
+
+
+class FrameScaler:
+    """
+    Upscale FrameBuilder frames to display pixels without matplotlib.
 
-    def _draw_frame(frame):
-        ax.clear()
-        ax.imshow(frame, origin="lower", interpolation="nearest")
-        ax.set_xlim(-0.5, width - 0.5)
-        ax.set_ylim(-0.5, height - 0.5)
+    Every cell becomes a `scale` x `scale` block (integer nearest-neighbour)
+    and rows are flipped so y grows upwards, as with imshow(origin="lower").
+    The optional grid is a one-pixel line through the centre of every
+    `grid_spacing`-th cell, alpha-blended in `grid_color` like the
+    matplotlib grid. Output goes into one reused uint8 buffer.
+    """
 
+    def __init__(
+        self,
+        width,
+        height,
+        scale,
+        show_grid=False,
+        grid_spacing=5,
+        grid_alpha=0.25,
+        grid_color="#7a7a7a",
+    ):
+        self.scale = scale
+        self.pixels = np.zeros((height * scale, width * scale, 3), dtype=np.uint8)
+        self._blocks = self.pixels.reshape(height, scale, width, scale, 3)
+        self.indices = np.zeros((height * scale, width * scale), dtype=np.uint8)
+        self._index_blocks = self.indices.reshape(height, scale, width, scale)
+        self.grid = None
         if show_grid:
-            xticks = np.arange(0, width, grid_spacing)
-            yticks = np.arange(0, height, grid_spacing)
-            ax.set_xticks(xticks)
-            ax.set_yticks(yticks)
-            ax.grid(True, color=grid_color, alpha=grid_alpha, linewidth=0.3)
+            mask = np.zeros(self.pixels.shape[:2], dtype=bool)
+            centre = scale // 2
+            # Grid rows count from the bottom of the flipped image.
+            rows = (height - 1 - np.arange(0, height, grid_spacing)) * scale + centre
+            cols = np.arange(0, width, grid_spacing) * scale + centre
+            mask[rows, :] = True
+            mask[:, cols] = True
+            self.grid = mask
+            self.grid_alpha = float(grid_alpha)
+            self.grid_rgb = _hex_rgb(grid_color) * self.grid_alpha
+
+    def scale_frame(self, frame):
+        self._blocks[:] = frame[::-1, None, :, None, :]
+        if self.grid is not None:
+            lines = self.pixels[self.grid]
+            self.pixels[self.grid] = np.round(
+                lines * (1.0 - self.grid_alpha) + self.grid_rgb
+            ).astype(np.uint8)
+        return self.pixels
+
+    def scale_indexed(self, frame):
+        """
+        Palettized version of `scale_frame` for GIF: returns (indices,
+        palette) with a (n, 3) uint8 palette, or None if the frame needs
+        more than 256 colours. The palette is found on the cell-sized
+        frame, so no pixel-level quantization is needed.
+        """
+        packed = (
+            frame[:, :, 0].astype(np.uint32) << 16
+            | frame[:, :, 1].astype(np.uint32) << 8
+            | frame[:, :, 2]
+        )
+        colors, inverse = np.unique(packed, return_inverse=True)
+        n = len(colors)
+        palette = np.column_stack(((colors >> 16) & 255, (colors >> 8) & 255, colors & 255))
+        if self.grid is not None:
+            # Entry k + n is colour k under a grid line.
+            blended = np.round(palette * (1.0 - self.grid_alpha) + self.grid_rgb)
+            palette = np.concatenate((palette, blended))
+        if len(palette) > 256:
+            return None
+        self._index_blocks[:] = inverse.reshape(frame.shape[:2])[::-1, None, :, None]
+        if self.grid is not None:
+            self.indices[self.grid] += n
+        return self.indices, palette.astype(np.uint8)
+
+
+class _GifWriter:
+    """
+    Append palettized frames to an animated GIF as they arrive.
+
+    Each frame carries its own colour table and only the rectangle that
+    changed since the previous frame is encoded (Pillow's frame encoder
+    does the LZW); a frame identical to the previous one extends its
+    duration instead. At most the previous frame is held, so memory does
+    not grow with the number of frames. The file is created on the first
+    frame.
+    """
+
+    def __init__(self, target, duration):
+        self.target = target
+        self.duration = duration
+        self.file = None
+        self._previous = None
+        self._pending = None
+
+    def write(self, image):
+        rgb = np.asarray(image.getpalette(), dtype=np.uint8).reshape(-1, 3)[np.asarray(image)]
+        if self._previous is None:
+            self._open(image.size)
+            box = (0, 0) + image.size
         else:
-            ax.set_xticks([])
-            ax.set_yticks([])
+            changed = (rgb != self._previous).any(axis=2)
+            rows = np.flatnonzero(changed.any(axis=1))
+            if len(rows) == 0:
+                self._pending[2] += self.duration
+                return
+            cols = np.flatnonzero(changed.any(axis=0))
+            box = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+        self._flush()
+        self._pending = [image.crop(box), box[:2], self.duration]
+        self._previous = rgb
+
+    def _open(self, size):
+        width, height = size
+        self.file = open(self.target, "wb")
+        # Header and logical screen without a global colour table, then
+        # the NETSCAPE2.0 extension for an endless loop.
+        self.file.write(
+            b"GIF89a"
+            + width.to_bytes(2, "little")
+            + height.to_bytes(2, "little")
+            + bytes((0, 0, 0))
+            + b"!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00"
+        )
+
+    def _flush(self):
+        if self._pending is None:
+            return
+        from PIL import GifImagePlugin
+
+        image, offset, duration = self._pending
+        self._pending = None
+        for chunk in GifImagePlugin.getdata(
+            image, offset, duration=duration, include_color_table=True
+        ):
+            self.file.write(chunk)
+
+    def close(self):
+        if self.file is None:
+            return
+        try:
+            self._flush()
+            self.file.write(b";")
+        finally:
+            self.file.close()
+            self.file = None
+
+
+def _ffmpeg_writer(target, width, height, fps):
+    import shutil
+    import subprocess
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError(f"ffmpeg is required to write {target.suffix} files")
+    return subprocess.Popen(
+        [
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+            "-r", str(fps), "-i", "-",
+            # yuv420p needs even dimensions.
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p",
+            str(target),
+        ],
+        stdin=subprocess.PIPE,
+    )
 
-        ax.set_facecolor("black")
+
+def encode_life(
+    life,
+    steps=200,
+    width=100,
+    height=100,
+    save="output.mp4",
+    speed=1.0,
+    show_stream=False,
+    stream_decay=0.93,
+    stream_intensity=0.35,
+    show_grid=False,
+    grid_spacing=5,
+    grid_alpha=0.25,
+    grid_color="#7a7a7a",
+    highlight_regions=None,
+    step_callback=None,
+    scale=None,
+    pipeline=True,
+    frame_stride=1,
+    start_at=0,
+    viewport=None,
+    max_size=None,
+):
+    """
+    Matplotlib-free counterpart of `animate_life` with the same arguments.
+
+    Frames are upscaled straight to RGB bytes (`scale` pixels per cell,
+    by default about 720 pixels along the longer side) and piped to
+    ffmpeg's stdin for video, appended to a GIF frame by frame, or saved
+    with Pillow for a still image. There are no axes or margins: one cell is
+    exactly a `scale` x `scale` block.
+    """
+    from pathlib import Path
+
+    from PIL import Image
+
+    target = Path(save)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    step_callback = _skip_to_start(life, start_at, step_callback)
+    view = resolve_viewport(life, viewport, width, height, max_size)
+    width, height = view.width, view.height
+    grid_spacing = _grid_pixels(show_grid, grid_spacing, view)
+    if scale is None:
+        scale = max(1, 720 // max(width, height))
+
+    frames = FrameBuilder(
+        width,
+        height,
+        show_stream=show_stream,
+        stream_decay=stream_decay,
+        stream_intensity=stream_intensity,
+        highlight_regions=highlight_regions,
+        frame_stride=frame_stride,
+        viewport=view,
+    )
+    scaler = FrameScaler(
+        width,
+        height,
+        scale,
+        show_grid=grid_spacing is not None,
+        grid_spacing=grid_spacing or 1,
+        grid_alpha=grid_alpha,
+        grid_color=grid_color,
+    )
 
     suffix = target.suffix.lower()
     if suffix in {".png", ".jpg", ".jpeg"}:
         if step_callback is not None:
             step_callback(life, 0)
-        frame = _build_frame()
-        _draw_frame(frame)
-        fig.savefig(target, dpi=200, bbox_inches="tight")
-        plt.close(fig)
+        Image.fromarray(scaler.scale_frame(frames.build(life))).save(target)
         return
 
     base_fps = 20
     fps = max(1, int(round(base_fps * float(speed))))
+
     if suffix == ".gif":
-        writer = animation.PillowWriter(fps=fps)
-    else:
-        writer = animation.FFMpegWriter(fps=fps)
+        # Frames are palettized at cell resolution in the rasterize stage,
+        # one byte per pixel.
+        def _palettized(coords):
+            frame = frames.build_coords(coords)
+            indexed = scaler.scale_indexed(frame)
+            if indexed is None:
+                return Image.fromarray(scaler.scale_frame(frame)).quantize(colors=256)
+            indices, palette = indexed
+            image = Image.frombytes("P", indices.shape[::-1], indices.tobytes())
+            image.putpalette(palette.tobytes())
+            return image
 
-    with writer.saving(fig, str(target), dpi=200):
-        for t in range(steps):
-            if step_callback is not None:
-                step_callback(life, t)
-            frame = _build_frame()
-            _draw_frame(frame)
-            writer.grab_frame()
-            life.step()
+        writer = _GifWriter(target, round(1000 / fps))
+        try:
+            run_pipeline(
+                life,
+                steps,
+                rasterize=_palettized,
+                consume=writer.write,
+                step_callback=step_callback,
+                threaded=pipeline,
+                frame_stride=frame_stride,
+            )
+        finally:
+            writer.close()
+        return
 
-    plt.close(fig)
+    process = _ffmpeg_writer(target, width * scale, height * scale, fps)
+    try:
+        run_pipeline(
+            life,
+            steps,
+            rasterize=lambda coords: scaler.scale_frame(frames.build_coords(coords)).tobytes(),
+            consume=process.stdin.write,
+            step_callback=step_callback,
+            threaded=pipeline,
+            frame_stride=frame_stride,
+        )
+    finally:
+        process.stdin.close()
+        code = process.wait()
+    if code != 0:
+        raise RuntimeError(f"ffmpeg exited with status {code} writing {target}")
@@ -0,0 +1,97 @@
+import numpy as np
+
+from dense_engine import DenseEngine, as_coords
+
+
+class BatchedEngine(DenseEngine):
+    """
+    `batch` universes stepped together as one (batch, H, W) uint8 array.
+
+    grid[k, y - y0, x - x0] holds cell (x, y) of universe k. All universes
+    share the window and origin, which grow as in DenseEngine whenever any
+    of them reaches the edge, so one call of the shifted-sum kernel steps
+    them all. Meant for sweeps over nearly identical universes (inputs,
+    phases, truth tables); counts and populations come back as arrays with
+    one entry per universe. `alive` and `coords()` without an index read
+    universe 0.
+    """
+
+    def __init__(self, batch):
+        super().__init__()
+        self.batch = batch
+        self.grid = np.zeros((batch, 0, 0), dtype=np.uint8)
+
+    @classmethod
+    def from_lives(cls, lives):
+        """
+        A batch holding the current cells of every Life in `lives`.
+        """
+        lives = list(lives)
+        engine = cls(len(lives))
+        for index, life in enumerate(lives):
+            engine.add(life.coords(), index=index)
+        return engine
+
+    @property
+    def alive(self):
+        """
+        Cells of universe 0, so helpers written for one universe (probes,
+        the animator, Life.coords) see the first one; `alive_sets()` has
+        them all.
+        """
+        return self.alive_set(0)
+
+    def alive_set(self, index):
+        xs, ys = self.coords(index).T
+        return frozenset(zip(xs.tolist(), ys.tolist()))
+
+    def alive_sets(self):
+        return [self.alive_set(index) for index in range(self.batch)]
+
+    def coords(self, index=0):
+        if not -self.batch <= index < self.batch:
+            raise IndexError(f"universe {index} out of range for a batch of {self.batch}")
+        ys, xs = np.nonzero(self.grid[index])
+        return np.column_stack((xs + self.x0, ys + self.y0)).astype(np.int64)
+
+    def add(self, cells, index=None):
+        """
+        Add cells to universe `index`, or to every universe if it is None.
+        """
+        coords = as_coords(cells)
+        if len(coords) == 0:
+            return
+        xs = coords[:, 0]
+        ys = coords[:, 1]
+        self._fit(int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max()))
+        if index is None:
+            self.grid[:, ys - self.y0, xs - self.x0] = 1
+        else:
+            self.grid[index, ys - self.y0, xs - self.x0] = 1
+
+    def population(self):
+        return np.count_nonzero(self.grid, axis=(1, 2))
+
+    def _occupancy(self):
+        return self.grid.any(axis=0)
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        window = self._window(xmin, xmax, ymin, ymax)
+        if window is None:
+            return np.zeros(self.batch, dtype=np.int64)
+        return np.count_nonzero(window, axis=(1, 2))
+
+    def region_has_live(self, xmin, xmax, ymin, ymax):
+        window = self._window(xmin, xmax, ymin, ymax)
+        if window is None:
+            return np.zeros(self.batch, dtype=bool)
+        return window.any(axis=(1, 2))
+
+    def region_counts(self, boxes):
+        """
+        (batch, len(boxes)) live-cell counts for (xmin, xmax, ymin, ymax) boxes.
+        """
+        counts = np.zeros((self.batch, len(boxes)), dtype=np.int64)
+        for i, box in enumerate(boxes):
+            counts[:, i] = self.region_count(*box)
+        return counts
@@ -0,0 +1,384 @@
+"""
+Reproducible benchmarks for the simulation, placement and rendering paths.
+
+    python src/benchmarks.py --out bench.json --baseline benchmarks/baseline.json
+    python src/benchmarks.py --quick --update-baseline benchmarks/baseline.json
+
+Timings depend on the machine, so no baseline is committed: record one with
+--update-baseline on the machine that will run the comparisons, with the
+same --quick setting.
+
+Every scenario is built from the project's own components. Timings are the
+median of `repeat` runs with the garbage collector off; peak memory is
+measured in a separate traced run so tracing does not slow the timings.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from circuit import CircuitBuilder
+from components import Components
+from demo import build_and_to_not, build_pattern
+from life_engine import Life
+from parallel_runner import StripePool, run_striped
+from pattern_cache import _load_symmetries
+from verifier import build_gate
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# metric -> True if larger is better. Metrics missing here are reported
+# but never compared.
+METRICS = {
+    "gens_per_sec": True,
+    "peak_mem_bytes": False,
+    "build_cold_s": False,
+    "build_warm_s": False,
+    "frames_per_sec": True,
+}
+# Differences below these absolute amounts are noise, whatever the ratio.
+# Rates (gens_per_sec, frames_per_sec) are judged by the run time behind
+# them: a fast run that took a few milliseconds either way is not compared.
+NOISE_FLOOR = {
+    "peak_mem_bytes": 256 * 1024,
+    "build_cold_s": 0.01,
+    "build_warm_s": 0.01,
+    "seconds": 0.02,
+}
+RATES = ("gens_per_sec", "frames_per_sec")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BACKENDS = ("set", "bitpacked", "hashlife")
+
+
+def build_gate_grid(comp, n, config_name="and_gate", inputs=None, spacing=260):
+    """
+    `n` x `n` copies of a gate on a `spacing` grid, placed in one insertion.
+    """
+    inputs = {"A": True, "B": True} if inputs is None else inputs
+    builder = CircuitBuilder(Life(), comp, cell_w=spacing, cell_h=spacing)
+    placed = comp.place_many(
+        builder.circuit,
+        [
+            {
+                "config_name": config_name,
+                "origin_x": gx * spacing,
+                "origin_y": -gy * spacing,
+                "phase_override": 1,
+                "inputs": inputs,
+            }
+            for gy in range(n)
+            for gx in range(n)
+        ],
+    )
+    for i, node in enumerate(placed):
+        builder.nodes[f"g{i}"] = node
+    return builder
+
+
+def build_soup(comp, size, density=0.3, seed=0):
+    """
+    A `size` x `size` random soup, the same for every run.
+    """
+    rng = np.random.default_rng(seed)
+    ys, xs = np.nonzero(rng.random((size, size)) < density)
+    life = Life()
+    life.add(np.column_stack((xs, ys)))
+    return life
+
+
+def build_gate_grid_loop(comp, n, config_name="and_gate", inputs=None, spacing=260):
+    """
+    The grid of `build_gate_grid`, placed one `add_component` at a time.
+    """
+    inputs = {"A": True, "B": True} if inputs is None else inputs
+    builder = CircuitBuilder(Life(), comp, cell_w=spacing, cell_h=spacing)
+    for gy in range(n):
+        for gx in range(n):
+            builder.add_component(
+                f"g{gy * n + gx}", config_name, gx, -gy, phase_override=1, inputs=inputs
+            )
+    return builder
+
+
+@dataclass
+class Scenario:
+    """
+    `build(comp)` returns a Life or a CircuitBuilder; `steps` generations
+    (0 to only time the build) are simulated per backend and `frames` (0
+    for none) rendered.
+    """
+    name: str
+    build: object
+    steps: int
+    frames: int = 0
+    size: tuple = (260, 260)
+    backends: tuple = None
+
+
+def scenarios(grid=3):
+    return [
+        Scenario("glider", partial(build_pattern, pattern_name="glider"), steps=1000, frames=60, size=(60, 60)),
+        Scenario("gosper_gun", partial(build_pattern, pattern_name="gun"), steps=10_000),
+        Scenario("not_gate", partial(build_gate, config_name="not_gate", inputs={"A": True}), steps=2000),
+        Scenario(
+            "and_gate",
+            partial(build_gate, config_name="and_gate", inputs={"A": True, "B": True}),
+            steps=2000,
+            frames=30,
+            size=(420, 420),
+        ),
+        Scenario(
+            "or_gate",
+            partial(build_gate, config_name="or_gate", inputs={"A": True, "B": True}),
+            steps=2000,
+        ),
+        Scenario("and_to_not", build_and_to_not, steps=420),
+        Scenario(f"gate_grid_{grid}x{grid}", partial(build_gate_grid, n=grid), steps=500),
+        # The same grid placed gate by gate, to compare against place_many.
+        Scenario(f"gate_grid_{grid}x{grid}_loop", partial(build_gate_grid_loop, n=grid), steps=0),
+        # parallel_runner on one and on several workers against the engine
+        # its stripes run.
+        Scenario(
+            "soup_512",
+            partial(build_soup, size=512),
+            steps=512,
+            backends=("bitpacked", "striped:1", f"striped:{max(2, os.cpu_count() or 1)}"),
+        ),
+    ]
+
+
+def _universe(built):
+    return getattr(built, "life", built)
+
+
+def _median_of(repeat, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return float(np.median(times)), result
+
+
+def _on_backend(cells, backend):
+    life = Life(backend=backend)
+    life.add(cells)
+    return life
+
+
+def measure_build(scenario, patterns_dir, repeat):
+    # Cold: a fresh Components and an empty in-process pattern LRU, so
+    # stamps are compiled and patterns read from the on-disk cache every
+    # sample; warm: the same Components again.
+    def cold_build():
+        _load_symmetries.cache_clear()
+        comp = Components(str(patterns_dir))
+        start = time.perf_counter()
+        built = scenario.build(comp)
+        return time.perf_counter() - start, comp, built
+
+    cold = []
+    for _ in range(repeat):
+        elapsed, comp, built = cold_build()
+        cold.append(elapsed)
+    warm, _ = _median_of(repeat, lambda: scenario.build(comp))
+    return {"build_cold_s": float(np.median(cold)), "build_warm_s": warm}, _universe(built).coords()
+
+
+def measure_run(cells, backend, steps, repeat):
+    # "striped:N" is parallel_runner.run_striped on N workers, with one
+    # pool for all samples so process start-up is not timed.
+    kind, _, workers = backend.partition(":")
+    pool = None
+    if kind == "striped":
+        workers = int(workers)
+        pool = StripePool(workers) if workers > 1 else None
+
+    def run():
+        if kind == "striped":
+            return run_striped(_on_backend(cells, "bitpacked"), steps, workers=workers, pool=pool)
+        life = _on_backend(cells, backend)
+        life.advance(steps)
+        return life
+
+    try:
+        elapsed, life = _median_of(repeat, run)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if pool is not None:
+            pool.close()
+    return {
+        "gens_per_sec": steps / elapsed if elapsed else float("inf"),
+        "peak_mem_bytes": peak,
+        "population": life.population(),
+        "seconds": elapsed,
+    }
+
+
+def measure_render(cells, frames, size, repeat):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import animator
+
+    width, height = size
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "bench.gif")
+        elapsed, _ = _median_of(
+            repeat,
+            lambda: animator.animate_life(
+                _on_backend(cells, "set"), steps=frames, width=width, height=height, save=target
+            ),
+        )
+    return {"frames_per_sec": frames / elapsed, "seconds": elapsed}
+
+
+def run_suite(
+    backends=DEFAULT_BACKENDS,
+    quick=False,
+    repeat=5,
+    grid=3,
+    render=True,
+    only=None,
+    patterns_dir=None,
+    log=print,
+):
+    """
+    Run every scenario and return the results document: "meta" describes
+    the machine and "results" maps "<scenario>/<backend>" (simulation),
+    "<scenario>/build" and "<scenario>/render" to their metrics. `quick`
+    simulates and renders a tenth as much.
+    """
+    patterns_dir = patterns_dir or ROOT / "patterns"
+    scale = 10 if quick else 1
+    results = {}
+    for scenario in scenarios(grid):
+        if only and scenario.name not in only:
+            continue
+        metrics, cells = measure_build(scenario, patterns_dir, repeat)
+        results[f"{scenario.name}/build"] = metrics
+        log(f"{scenario.name}: {len(cells)} cells, built in {metrics['build_cold_s']:.3f}s")
+        steps = max(1, scenario.steps // scale) if scenario.steps else 0
+        for backend in (scenario.backends or backends) if steps else ():
+            metrics = {"steps": steps, **measure_run(cells, backend, steps, repeat)}
+            results[f"{scenario.name}/{backend}"] = metrics
+            log(f"  {backend}: {metrics['gens_per_sec']:.1f} gens/s, peak {metrics['peak_mem_bytes'] / 1e6:.1f} MB")
+        if render and scenario.frames:
+            frames = max(2, scenario.frames // scale)
+            metrics = {"frames": frames, **measure_render(cells, frames, scenario.size, repeat)}
+            results[f"{scenario.name}/render"] = metrics
+            log(f"  animate_life: {metrics['frames_per_sec']:.1f} frames/s")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "repeat": repeat,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, thresholds=None):
+    """
+    Regressions of `current` against `baseline` (both run_suite documents):
+    a list of (key, metric, baseline value, current value, relative change)
+    for every metric in METRICS that got worse by more than its threshold
+    and by more than its NOISE_FLOOR (for rates, of the run time).
+    `thresholds` overrides `threshold` per metric. Keys present in only one
+    document are skipped.
+    """
+    thresholds = thresholds or {}
+    regressions = []
+    for key, metrics in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in metrics or not base.get(metric):
+                continue
+            if abs(metrics[metric] - base[metric]) < NOISE_FLOOR.get(metric, 0):
+                continue
+            if metric in RATES and abs(metrics.get("seconds", 0) - base.get("seconds", 0)) < NOISE_FLOOR["seconds"]:
+                continue
+            change = (metrics[metric] - base[metric]) / base[metric]
+            worse = -change if higher_is_better else change
+            if worse > thresholds.get(metric, threshold):
+                regressions.append((key, metric, base[metric], metrics[metric], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", default=",".join(DEFAULT_BACKENDS))
+    parser.add_argument("--quick", action="store_true", help="a tenth of the steps and frames")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per measurement; the median is kept")
+    parser.add_argument("--grid", type=int, default=3, help="size of the synthetic gate grid")
+    parser.add_argument("--no-render", action="store_true")
+    parser.add_argument("--only", help="comma-separated scenario names")
+    parser.add_argument("--out", help="write the results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--update-baseline", metavar="PATH", help="store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+    if args.baseline and not Path(args.baseline).is_file():
+        parser.exit(
+            2,
+            f"no baseline at {args.baseline}; record one on this machine first with\n"
+            f"    python src/benchmarks.py{' --quick' if args.quick else ''} --update-baseline {args.baseline}\n",
+        )
+
+    current = run_suite(
+        backends=tuple(args.backends.split(",")),
+        quick=args.quick,
+        repeat=args.repeat,
+        grid=args.grid,
+        render=not args.no_render,
+        only=set(args.only.split(",")) if args.only else None,
+    )
+    for path in (args.out, args.update_baseline):
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(current, indent=1, sort_keys=True) + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("quick") != current["meta"]["quick"]:
+            print("warning: baseline and current run differ in --quick", file=sys.stderr)
+        regressions = compare(current, baseline, args.threshold)
+        for key, metric, old, new, change in regressions:
+            print(f"REGRESSION {key} {metric}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
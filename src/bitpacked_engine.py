@@ -0,0 +1,218 @@
+import numpy as np
+
+from dense_engine import as_coords
+
+
+_ONE = np.uint64(1)
+_TOP = np.uint64(63)
+
+
+def popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    flat = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return int(np.unpackbits(flat).sum())
+
+
+def _half_add(a, b):
+    return a ^ b, a & b
+
+
+def _full_add(a, b, c):
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+
+def next_generation(words):
+    """
+    Advance a (rows, words) uint64 bit-plane by one generation.
+
+    Bit b of words[r, k] is the cell at column 64 * k + b of row r. The eight
+    neighbour planes are summed with a full-adder tree, so every bitwise op
+    updates 64 cells; only the count modulo 8 is needed because 8 neighbours
+    must map to "dead" just like 0.
+    """
+    # Horizontal neighbours: left[x] = cell[x - 1], right[x] = cell[x + 1],
+    # carrying the boundary bit across neighbouring words.
+    left = words << _ONE
+    left[:, 1:] |= words[:, :-1] >> _TOP
+    right = words >> _ONE
+    right[:, :-1] |= words[:, 1:] << _TOP
+
+    def up(plane):
+        shifted = np.zeros_like(plane)
+        shifted[1:] = plane[:-1]
+        return shifted
+
+    def down(plane):
+        shifted = np.zeros_like(plane)
+        shifted[:-1] = plane[1:]
+        return shifted
+
+    s0, c0 = _full_add(up(left), up(words), up(right))
+    s1, c1 = _full_add(down(left), down(words), down(right))
+    s2, c2 = _half_add(left, right)
+    ones, c3 = _full_add(s0, s1, s2)
+    t, fours_a = _full_add(c0, c1, c2)
+    twos, fours_b = _half_add(t, c3)
+    fours = fours_a ^ fours_b
+
+    # count in {2, 3}: twos set, fours clear; count 3 also needs ones,
+    # count 2 only keeps an already live cell.
+    return twos & ~fours & (ones | words)
+
+
+class BitPackedEngine:
+    """
+    Universe stored as rows of uint64 words, 64 cells per word.
+
+    words[y - y0, k] bit b holds the cell at world x = x0 + 64 * k + b. As in
+    the dense engine the first/last row and the outermost bit columns are
+    kept empty before each step so the universe can grow exactly.
+    """
+
+    _GROW_ROWS = 32
+    _GROW_WORDS = 1
+
+    def __init__(self):
+        self.words = np.zeros((0, 0), dtype=np.uint64)
+        self.x0 = 0
+        self.y0 = 0
+        self.track_changes = False
+        self.changes = None
+        self.considered = 0
+        self.profile = None
+
+    @property
+    def alive(self):
+        xs, ys = self.coords().T
+        return frozenset(zip(xs.tolist(), ys.tolist()))
+
+    def coords(self):
+        return self._coords_of(self.words)
+
+    def _coords_of(self, words):
+        rows, cols = np.nonzero(words)
+        if len(rows) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        packed = np.ascontiguousarray(words[rows, cols], dtype="<u8")
+        bits = np.unpackbits(packed.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        which, bit = np.nonzero(bits)
+        xs = self.x0 + cols[which].astype(np.int64) * 64 + bit
+        ys = self.y0 + rows[which].astype(np.int64)
+        return np.column_stack((xs, ys))
+
+    def population(self):
+        return popcount(self.words)
+
+    def _fit(self, xmin, xmax, ymin, ymax):
+        h, w = self.words.shape
+        if h == 0:
+            self.x0 = xmin - 64 * self._GROW_WORDS
+            self.y0 = ymin - self._GROW_ROWS
+            n_words = (xmax - self.x0) // 64 + 1 + self._GROW_WORDS
+            n_rows = ymax - ymin + 1 + 2 * self._GROW_ROWS
+            self.words = np.zeros((n_rows, n_words), dtype=np.uint64)
+            return
+
+        grow_rows = max(self._GROW_ROWS, h // 2)
+        grow_words = max(self._GROW_WORDS, w // 2)
+        top = grow_rows if ymin - 1 < self.y0 else 0
+        bottom = grow_rows if ymax + 1 > self.y0 + h - 1 else 0
+        left = grow_words if xmin - 1 < self.x0 else 0
+        right = grow_words if xmax + 1 > self.x0 + 64 * w - 1 else 0
+        if top or bottom or left or right:
+            top += max(0, self.y0 - ymin)
+            bottom += max(0, ymax - (self.y0 + h - 1))
+            left += max(0, -((xmin - self.x0) // 64))
+            right += max(0, (xmax - self.x0) // 64 - (w - 1))
+            self.words = np.pad(self.words, ((top, bottom), (left, right)))
+            self.x0 -= 64 * left
+            self.y0 -= top
+
+    def add(self, cells):
+        coords = as_coords(cells)
+        if len(coords) == 0:
+            return
+        xs = coords[:, 0]
+        ys = coords[:, 1]
+        self._fit(int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max()))
+        offset = xs - self.x0
+        bits = np.left_shift(_ONE, (offset % 64).astype(np.uint64))
+        np.bitwise_or.at(self.words, (ys - self.y0, offset // 64), bits)
+
+    def _touches_edge(self):
+        words = self.words
+        return bool(
+            words[0].any()
+            or words[-1].any()
+            or (words[:, 0] & _ONE).any()
+            or (words[:, -1] >> _TOP).any()
+        )
+
+    def step(self):
+        if self.words.size == 0:
+            return
+        profile = self.profile
+        if profile is not None:
+            profile.begin()
+        if self._touches_edge():
+            self._fit(*self.bounding_box())
+        if profile is not None:
+            profile.lap("grow")
+        new = next_generation(self.words)
+        self.considered = 64 * new.size
+        if profile is not None:
+            profile.lap("kernel")
+        if self.track_changes:
+            flipped = new ^ self.words
+            self.changes = (
+                self._coords_of(flipped & new).tolist(),
+                self._coords_of(flipped & self.words).tolist(),
+            )
+            if profile is not None:
+                profile.lap("changes")
+        self.words = new
+
+    def bounding_box(self):
+        rows = np.flatnonzero(self.words.any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(self.words.any(axis=0))
+        first = int(np.bitwise_or.reduce(self.words[:, cols[0]]))
+        last = int(np.bitwise_or.reduce(self.words[:, cols[-1]]))
+        low_bit = (first & -first).bit_length() - 1
+        high_bit = last.bit_length() - 1
+        return (
+            self.x0 + 64 * int(cols[0]) + low_bit,
+            self.x0 + 64 * int(cols[-1]) + high_bit,
+            int(rows[0]) + self.y0,
+            int(rows[-1]) + self.y0,
+        )
+
+    def _masked_window(self, xmin, xmax, ymin, ymax):
+        h, w = self.words.shape
+        r0 = max(0, ymin - self.y0)
+        r1 = min(h, ymax - self.y0 + 1)
+        lo = max(0, xmin - self.x0)
+        hi = min(64 * w - 1, xmax - self.x0)
+        if r0 >= r1 or lo > hi:
+            return None
+        c0 = lo // 64
+        c1 = hi // 64
+        masks = []
+        for c in range(c0, c1 + 1):
+            b0 = max(lo - 64 * c, 0)
+            b1 = min(hi - 64 * c, 63)
+            masks.append(((1 << (b1 + 1)) - 1) ^ ((1 << b0) - 1))
+        return self.words[r0:r1, c0 : c1 + 1] & np.array(masks, dtype=np.uint64)
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        window = self._masked_window(xmin, xmax, ymin, ymax)
+        if window is None:
+            return 0
+        return popcount(window)
+
+    def region_has_live(self, xmin, xmax, ymin, ymax):
+        window = self._masked_window(xmin, xmax, ymin, ymax)
+        return window is not None and bool(window.any())
@@ -0,0 +1,97 @@
+import json
+import struct
+
+import numpy as np
+
+
+MAGIC = b"LIFECKPT"
+VERSION = 1
+
+# magic, version, header length; the JSON header follows, padded so the cell
+# array starts on an 8-byte boundary.
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def save_checkpoint(life, path, metadata=None):
+    """
+    Write a Life universe to `path`.
+
+    The file is a fixed preamble, a JSON header (generation, backend, engine
+    options, cell count and the caller's `metadata`) and then the live cells
+    as a little-endian int64 (N, 2) array of (x, y) rows sorted by y then x.
+    The raw array needs no parsing, so `load_checkpoint` can memory-map it.
+    """
+    coords = life.coords()
+    if len(coords):
+        coords = coords[np.lexsort((coords[:, 0], coords[:, 1]))]
+    header = json.dumps(
+        {
+            "generation": life.generation,
+            "backend": life.backend,
+            "engine_options": life.engine_options,
+            "cells": len(coords),
+            "metadata": metadata or {},
+        }
+    ).encode("utf-8")
+    header += b" " * (-(_PREAMBLE.size + len(header)) % 8)
+    with open(path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        f.write(np.ascontiguousarray(coords, dtype="<i8").tobytes())
+
+
+def read_checkpoint(path, mmap=True):
+    """
+    Read a checkpoint written by `save_checkpoint`.
+
+    Returns (header, coords). With `mmap` the coordinates are a read-only
+    memory map of the file, so even huge checkpoints open without copying.
+    """
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path}: not a Life checkpoint")
+        magic, version, header_len = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a Life checkpoint")
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported checkpoint version {version}")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        offset = _PREAMBLE.size + header_len
+        n = header["cells"]
+        if n == 0:
+            return header, np.zeros((0, 2), dtype=np.int64)
+        if not mmap:
+            f.seek(offset)
+            coords = np.fromfile(f, dtype="<i8", count=2 * n)
+            return header, coords.reshape(n, 2)
+    return header, np.memmap(path, dtype="<i8", mode="r", offset=offset, shape=(n, 2))
+
+
+def load_checkpoint(path, backend=None, mmap=True, **engine_options):
+    """
+    Restore a Life universe from `path`, on the saved backend unless
+    `backend` is given. The saved metadata is set as `life.metadata`.
+
+    The array engines take the cells straight from the mapped array and
+    the set engines build their buckets from it in bulk. HashLife still
+    inserts the cells as tuples, so million-cell checkpoints take seconds
+    to load on it.
+    """
+    from life_engine import Life
+
+    header, coords = read_checkpoint(path, mmap=mmap)
+    if backend is None:
+        backend = header["backend"]
+        engine_options = {**header["engine_options"], **engine_options}
+    life = Life(backend=backend, **engine_options)
+    if hasattr(life.engine, "coords"):
+        # Array engines bulk-insert straight from the mapped array.
+        life.engine.add(coords)
+    elif hasattr(life.engine, "add_array"):
+        life.engine.add_array(coords)
+    else:
+        life.engine.add(zip(coords[:, 0].tolist(), coords[:, 1].tolist()))
+    life.generation = header["generation"]
+    life.metadata = header["metadata"]
+    return life
@@ -0,0 +1,179 @@
+import collections
+
+from life_engine import SetEngine, _grouped
+
+
+class ChunkedEngine(SetEngine):
+    """
+    Set engine that only re-evaluates tiles near recent changes.
+
+    The plane is split into `tile_size` x `tile_size` tiles. A tile whose own
+    cells and whose 8 neighbouring tiles did not change in the last generation
+    is a fixed point for the next one, so it is skipped outright. Step cost
+    therefore follows activity (moving gliders, gun cores) rather than the
+    total population of still lifes and empty space.
+
+    This pays off on mostly-still patterns: an eater field with one glider
+    steps hundreds of times faster than on "set". Where activity is spread
+    over the whole pattern (the gate circuits, whose guns and glider
+    streams keep every tile changing) nothing can be skipped, so a step in
+    which the active tiles cover every live tile falls back to the plain
+    set step and only updates the tiles from its births and deaths.
+
+    `last_step` holds the counters of the most recent step and `totals`
+    accumulates them over the engine's lifetime.
+    """
+
+    def __init__(self, tile_size=32):
+        super().__init__()
+        self.tile_size = tile_size
+        self.tiles = {}
+        self.dirty = set()
+        self.last_step = {"tiles": 0, "evaluated": 0, "skipped": 0, "changed": 0}
+        self.totals = dict(self.last_step)
+
+    def _tile_of(self, x, y):
+        return x // self.tile_size, y // self.tile_size
+
+    def add(self, cells):
+        fresh = set(cells) - self.cells
+        self.cells |= fresh
+        self._index_add(fresh)
+        for cell in fresh:
+            tile = self._tile_of(*cell)
+            self.tiles.setdefault(tile, set()).add(cell)
+            self.dirty.add(tile)
+
+    def _load(self, coords, cells):
+        super()._load(coords, cells)
+        self.tiles = _grouped(coords, cells, self.tile_size)
+        self.dirty = set(self.tiles)
+
+    def _on_tile_edge(self, x, y):
+        last = self.tile_size - 1
+        return x % self.tile_size in (0, last) or y % self.tile_size in (0, last)
+
+    def step(self):
+        active = set()
+        for tx, ty in self.dirty:
+            for dtx in (-1, 0, 1):
+                for dty in (-1, 0, 1):
+                    active.add((tx + dtx, ty + dty))
+        if self.tiles.keys() <= active:
+            self._step_all(len(active))
+            return
+
+        profile = self.profile
+        if profile is not None:
+            profile.begin()
+
+        sources = set()
+        for tx, ty in active:
+            for dtx in (-1, 0, 1):
+                for dty in (-1, 0, 1):
+                    tile = (tx + dtx, ty + dty)
+                    if tile in self.tiles:
+                        sources.add(tile)
+        if profile is not None:
+            profile.lap("tiles")
+
+        neighbor_count = collections.Counter()
+        for tile in sources:
+            # Cells of a neighbouring clean tile only reach into an active
+            # tile from that tile's border.
+            border_only = tile not in active
+            for x, y in self.tiles[tile]:
+                if border_only and not self._on_tile_edge(x, y):
+                    continue
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        if dx != 0 or dy != 0:
+                            neighbor_count[(x + dx, y + dy)] += 1
+        if profile is not None:
+            profile.lap("neighbours")
+
+        new_tiles = {tile: set() for tile in active}
+        for cell, count in neighbor_count.items():
+            tile = self._tile_of(*cell)
+            if tile not in new_tiles:
+                continue
+            if count == 3 or (count == 2 and cell in self.cells):
+                new_tiles[tile].add(cell)
+        self.considered = len(neighbor_count)
+        if profile is not None:
+            profile.lap("rules")
+
+        births_all = []
+        deaths_all = []
+        changed = set()
+        for tile, cells in new_tiles.items():
+            old = self.tiles.get(tile)
+            if old is None:
+                if not cells:
+                    continue
+                old = set()
+            if cells == old:
+                continue
+            changed.add(tile)
+            deaths = old - cells
+            births = cells - old
+            self.cells -= deaths
+            self.cells |= births
+            self._index_remove(deaths)
+            self._index_add(births)
+            births_all.extend(births)
+            deaths_all.extend(deaths)
+            if cells:
+                self.tiles[tile] = cells
+            else:
+                del self.tiles[tile]
+
+        self.dirty = changed
+        if self.track_changes:
+            self.changes = (births_all, deaths_all)
+        self._count(len(active), len(self.tiles.keys() - active), len(changed))
+        if profile is not None:
+            profile.lap("index")
+
+    def _step_all(self, evaluated):
+        # Nothing to skip: step every cell and move the changed ones
+        # between tiles.
+        track_changes = self.track_changes
+        self.track_changes = True
+        try:
+            super().step()
+        finally:
+            self.track_changes = track_changes
+        births, deaths = self.changes
+        if not track_changes:
+            self.changes = None
+        size = self.tile_size
+        tiles = self.tiles
+        changed = set()
+        for cell in deaths:
+            tile = (cell[0] // size, cell[1] // size)
+            cells = tiles[tile]
+            cells.discard(cell)
+            if not cells:
+                del tiles[tile]
+            changed.add(tile)
+        for cell in births:
+            tile = (cell[0] // size, cell[1] // size)
+            cells = tiles.get(tile)
+            if cells is None:
+                tiles[tile] = {cell}
+            else:
+                cells.add(cell)
+            changed.add(tile)
+        self.dirty = changed
+        self._count(evaluated, 0, len(changed))
+
+    def _count(self, evaluated, skipped, changed):
+        self.last_step = {
+            "tiles": len(self.tiles),
+            "evaluated": evaluated,
+            "skipped": skipped,
+            "changed": changed,
+        }
+        for key, value in self.last_step.items():
+            self.totals[key] += value
@@ -4,8 +4,7 @@ class Circuit:
         self.life = life
 
     def place(self, pattern, x, y):
-        for px, py in pattern:
-            self.life.alive.add((x + px, y + py))
+        self.life.add(pattern, offset=(x, y))
 
     def bounding_box(pattern):
         xs = [x for x, _ in pattern]
@@ -13,9 +12,8 @@ class Circuit:
         return min(xs), max(xs), min(ys), max(ys)
 
     def inject(self, pattern, x, y, t_delay=0):
-        for _ in range(t_delay):
-            self.life.step()
-
+        # advance() lets HashLife and detected cycles skip the delay.
+        self.life.advance(t_delay)
         self.place(pattern, x, y)
 
 
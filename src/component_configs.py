@@ -79,6 +79,17 @@ COMPONENT_CONFIGS = {
             {"name": "B", "kind": "input", "offset": (-120, 60), "direction": 315},
             {"name": "Y", "kind": "output", "offset": (36, 45), "direction": 315},
         ],
+        "regions": [
+            {
+                "name": "Y_lane",
+                "kind": "output",
+                "port": "Y",
+                "xmin": 82,
+                "xmax": 98,
+                "ymin": -136,
+                "ymax": -120,
+            },
+        ],
     },
     "or_gate": {
         "size": {"width": 220, "height": 240},
@@ -96,6 +107,17 @@ COMPONENT_CONFIGS = {
             {"name": "B", "kind": "input", "offset": (-60, 0), "direction": 315},
             {"name": "Y", "kind": "output", "offset": (36, 45), "direction": 315},
         ],
+        "regions": [
+            {
+                "name": "Y_lane",
+                "kind": "output",
+                "port": "Y",
+                "xmin": 52,
+                "xmax": 68,
+                "ymin": -166,
+                "ymax": -150,
+            },
+        ],
     },
     "not_gate": {
         "size": {"width": 220, "height": 220},
@@ -109,6 +131,17 @@ COMPONENT_CONFIGS = {
             {"name": "A", "kind": "input", "offset": (0, 0), "direction": 315},
             {"name": "Y", "kind": "output", "offset": (160, -160), "direction": 315},
         ],
+        "regions": [
+            {
+                "name": "Y_lane",
+                "kind": "output",
+                "port": "Y",
+                "xmin": 57,
+                "xmax": 73,
+                "ymin": -109,
+                "ymax": -93,
+            },
+        ],
     },
     "reflector": {
         "size": {"width": 9, "height": 23},
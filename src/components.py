@@ -1,9 +1,10 @@
-import os
 from dataclasses import dataclass
 
+import numpy as np
+
 from component_configs import COMPONENT_CONFIGS
-from pattern_transform import normalize, rotate_90, rotate_180, rotate_270
-from rle_loader import load_rle
+from life_engine import Life
+from pattern_registry import PatternRegistry
 
 
 @dataclass
@@ -27,41 +28,55 @@ class PlacedComponent:
     options: dict
 
 
+@dataclass
+class ComponentStamp:
+    """
+    A configuration compiled for one orientation, phase and input set:
+    `cells` is an (N, 2) int64 array and ports/regions are resolved, all
+    relative to the component origin.
+    """
+    cells: np.ndarray
+    ports: dict
+    regions: dict
+    size: dict
+
+
 class Components:
     _VALID_ROTATIONS = {0, 90, 180, 270}
+    # Short component names for pattern files.
+    _ALIASES = {"gun": "glider_gun"}
 
     def __init__(self, patterns_dir):
         self.patterns_dir = patterns_dir
         self.instances = []
-        self._load_base_patterns()
-
-    def _rotations(self, pattern):
-        base = normalize(pattern)
-        return {
-            0: base,
-            90: normalize(rotate_90(base)),
-            180: normalize(rotate_180(base)),
-            270: normalize(rotate_270(base)),
-        }
+        self._phased = {}
+        self._stamps = {}
+        self.patterns = PatternRegistry(patterns_dir)
 
-    def _load_base_patterns(self):
-        glider = load_rle(os.path.join(self.patterns_dir, "glider.rle"))
-        gun = load_rle(os.path.join(self.patterns_dir, "glider_gun.rle"))
-        eater = load_rle(os.path.join(self.patterns_dir, "eater.rle"))
-        reflector = load_rle(os.path.join(self.patterns_dir, "reflector.rle"))
-
-        self._patterns = {
-            "glider": self._rotations(glider),
-            "gun": self._rotations(gun),
-            "eater": self._rotations(eater),
-            "reflector": self._rotations(reflector),
-        }
-
-        for name, rots in self._patterns.items():
-            setattr(self, name, rots[0])
-            setattr(self, f"{name}_90", rots[90])
-            setattr(self, f"{name}_180", rots[180])
-            setattr(self, f"{name}_270", rots[270])
+    def _pattern_name(self, name):
+        name = self._ALIASES.get(name, name)
+        if name not in self.patterns:
+            raise ValueError(f"unknown component: {name}")
+        return name
+
+    def _pattern(self, name, rotation=0, reflect=False):
+        return self.patterns.get(self._pattern_name(name), rotation, reflect)
+
+    def __getattr__(self, attr):
+        # Lazy pattern attributes such as `glider`, `gun_90` or `snark_270`,
+        # as lists of (x, y) tuples like the eagerly loaded ones they replace.
+        if attr.startswith("_") or attr == "patterns":
+            raise AttributeError(attr)
+        name, _, suffix = attr.rpartition("_")
+        if suffix.isdigit() and int(suffix) in self._VALID_ROTATIONS:
+            rotation = int(suffix)
+        else:
+            name, rotation = attr, 0
+        try:
+            cells = self._pattern(name, rotation)
+        except ValueError:
+            raise AttributeError(attr) from None
+        return list(zip(cells[:, 0].tolist(), cells[:, 1].tolist()))
 
     def _resolve_rotation(self, rotation):
         if rotation not in self._VALID_ROTATIONS:
@@ -94,11 +109,54 @@ class Components:
         ys = [y for _, y in rotated]
         return min(xs), max(xs), min(ys), max(ys)
 
-    def _place_atomic(self, circuit, name, x, y, rotation=0):
+    def _place_atomic(self, circuit, name, x, y, rotation=0, reflect=False):
         rotation = self._resolve_rotation(rotation)
-        if name not in self._patterns:
-            raise ValueError(f"unknown component: {name}")
-        circuit.place(self._patterns[name][rotation], x, y)
+        circuit.place(self._pattern(name, rotation, reflect), x, y)
+
+    def _phased_pattern(self, name, rotation, reflect, generations):
+        """
+        (N, 2) cells of pattern `name` at `rotation` (mirrored first if
+        `reflect`) after evolving on its own for `generations` steps, in the
+        pattern's own coordinates. Cached per (name, rotation, reflect,
+        generations).
+        """
+        key = (self._pattern_name(name), rotation, reflect, generations)
+        if key not in self._phased:
+            life = Life()
+            life.add(self._pattern(name, rotation, reflect))
+            life.advance(generations)
+            self._phased[key] = life.coords()
+        return self._phased[key]
+
+    def _layout_part(self, part, orientation, phase_before=0):
+        local_x, local_y = part["offset"]
+        dx, dy = self._rotate_point(local_x, local_y, orientation)
+        part_rotation = self._compose_rotation(part["rotation"], orientation)
+        reflect = part.get("reflect", False)
+        return part["component"], dx, dy, part_rotation, reflect, phase_before
+
+    def _stamp_cells(self, layout):
+        """
+        Union of laid-out parts with their relative phases, as one array.
+
+        Each part's `phase_before` means "everything placed so far runs that
+        many generations before this part appears". Instead of stepping the
+        whole universe, every part is taken already advanced by the phase
+        accumulated after it, so the parts end up in the same relative
+        generations while the rest of the universe is left untouched.
+        """
+        lags = []
+        elapsed = 0
+        for *_, phase_before in reversed(layout):
+            lags.append(elapsed)
+            elapsed += phase_before
+        chunks = [
+            self._phased_pattern(name, rotation, reflect, lag) + (x, y)
+            for (name, x, y, rotation, reflect, _), lag in zip(layout, reversed(lags))
+        ]
+        if not chunks:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(chunks), axis=0)
 
     def _input_enabled(self, inputs, name):
         if inputs.get(name, False):
@@ -112,25 +170,19 @@ class Components:
             return True
         return False
 
-    def _place_input_guns(self, circuit, config_name, origin_x, origin_y, orientation, inputs):
+    def _input_gun_layout(self, config_name, orientation, inputs):
         config = COMPONENT_CONFIGS[config_name]
         input_guns = config.get("input_guns", {})
+        layout = []
         for name, gun in input_guns.items():
             if not self._input_enabled(inputs, name):
                 continue
-            phase_before = gun.get("phase_before", 0)
-            for _ in range(phase_before):
-                circuit.life.step()
-            local_x, local_y = gun["offset"]
-            dx, dy = self._rotate_point(local_x, local_y, orientation)
-            part_rotation = self._compose_rotation(gun["rotation"], orientation)
-            self._place_atomic(
-                circuit,
-                gun["component"],
-                origin_x + dx,
-                origin_y + dy,
-                rotation=part_rotation,
-            )
+            layout.append(self._layout_part(gun, orientation, gun.get("phase_before", 0)))
+        return layout
+
+    def _place_input_guns(self, circuit, config_name, origin_x, origin_y, orientation, inputs):
+        cells = self._stamp_cells(self._input_gun_layout(config_name, orientation, inputs))
+        circuit.place(cells, origin_x, origin_y)
 
     def _port_spec(self, config_name, port_name):
         if config_name not in COMPONENT_CONFIGS:
@@ -140,8 +192,8 @@ class Components:
                 return port
         raise ValueError(f"unknown port '{port_name}' for configuration '{config_name}'")
 
-    def place_component(self, circuit, name, x, y, rotation=0):
-        self._place_atomic(circuit, name, x, y, rotation=rotation)
+    def place_component(self, circuit, name, x, y, rotation=0, reflect=False):
+        self._place_atomic(circuit, name, x, y, rotation=rotation, reflect=reflect)
 
     def compute_origin_for_port(self, config_name, port_name, world_x, world_y, orientation):
         orientation = self._resolve_rotation(orientation)
@@ -210,23 +262,25 @@ class Components:
             inputs=inputs,
         )
 
-    def place_configured(
-        self,
-        circuit,
-        config_name,
-        origin_x,
-        origin_y,
-        orientation=0,
-        phase_override=None,
-        inputs=None,
-    ):
+    def compile(self, config_name, orientation=0, phase_override=None, inputs=None):
+        """
+        Compile a configuration into a ComponentStamp, cached per
+        (config_name, orientation, phase_override, enabled inputs).
+        """
         orientation = self._resolve_rotation(orientation)
         inputs = inputs or {}
 
         if config_name not in COMPONENT_CONFIGS:
             raise ValueError(f"unknown configuration: {config_name}")
 
+        enabled = tuple(sorted(name for name, on in inputs.items() if on))
+        key = (config_name, orientation, phase_override, enabled)
+        stamp = self._stamps.get(key)
+        if stamp is not None:
+            return stamp
+
         config = COMPONENT_CONFIGS[config_name]
+        layout = []
         for part in config["parts"]:
             enabled_by = part.get("enabled_by")
             if enabled_by is not None and not inputs.get(enabled_by, False):
@@ -236,29 +290,10 @@ class Components:
             if part.get("phase_override", False) and phase_override is not None:
                 phase_before = phase_override
 
-            for _ in range(phase_before):
-                circuit.life.step()
-
-            local_x, local_y = part["offset"]
-            dx, dy = self._rotate_point(local_x, local_y, orientation)
-            part_rotation = self._compose_rotation(part["rotation"], orientation)
-            self._place_atomic(
-                circuit,
-                part["component"],
-                origin_x + dx,
-                origin_y + dy,
-                rotation=part_rotation,
-            )
+            layout.append(self._layout_part(part, orientation, phase_before))
 
         # Apply referenced input guns (A/B/...) only when explicitly enabled.
-        self._place_input_guns(
-            circuit=circuit,
-            config_name=config_name,
-            origin_x=origin_x,
-            origin_y=origin_y,
-            orientation=orientation,
-            inputs=inputs,
-        )
+        layout.extend(self._input_gun_layout(config_name, orientation, inputs))
 
         ports = {}
         for port in config.get("ports", []):
@@ -268,8 +303,8 @@ class Components:
             ports[port["name"]] = Port(
                 name=port["name"],
                 kind=port["kind"],
-                x=origin_x + dx,
-                y=origin_y + dy,
+                x=dx,
+                y=dy,
                 direction=direction,
             )
 
@@ -285,10 +320,11 @@ class Components:
             regions[region["name"]] = {
                 "name": region["name"],
                 "kind": region.get("kind", "probe"),
-                "xmin": origin_x + xmin,
-                "xmax": origin_x + xmax,
-                "ymin": origin_y + ymin,
-                "ymax": origin_y + ymax,
+                "port": region.get("port"),
+                "xmin": xmin,
+                "xmax": xmax,
+                "ymin": ymin,
+                "ymax": ymax,
             }
 
         size = config.get("size")
@@ -299,19 +335,99 @@ class Components:
         if orientation in {90, 270}:
             width, height = height, width
 
+        stamp = ComponentStamp(
+            cells=self._stamp_cells(layout),
+            ports=ports,
+            regions=regions,
+            size={"width": width, "height": height},
+        )
+        self._stamps[key] = stamp
+        return stamp
+
+    def _instantiate(self, stamp, config_name, origin_x, origin_y, orientation, phase_override, inputs):
+        ports = {
+            name: Port(port.name, port.kind, origin_x + port.x, origin_y + port.y, port.direction)
+            for name, port in stamp.ports.items()
+        }
+        regions = {
+            name: {
+                **region,
+                "xmin": origin_x + region["xmin"],
+                "xmax": origin_x + region["xmax"],
+                "ymin": origin_y + region["ymin"],
+                "ymax": origin_y + region["ymax"],
+            }
+            for name, region in stamp.regions.items()
+        }
         placed = PlacedComponent(
             config_name=config_name,
             origin_x=origin_x,
             origin_y=origin_y,
             orientation=orientation,
             ports=ports,
-            size={"width": width, "height": height},
+            size=dict(stamp.size),
             regions=regions,
-            options={"phase_override": phase_override, "inputs": dict(inputs)},
+            options={"phase_override": phase_override, "inputs": dict(inputs or {})},
         )
         self.instances.append(placed)
         return placed
 
+    def place_configured(
+        self,
+        circuit,
+        config_name,
+        origin_x,
+        origin_y,
+        orientation=0,
+        phase_override=None,
+        inputs=None,
+    ):
+        """
+        Stamp a configuration into the universe at its current generation.
+
+        Phases only order the parts within the component (see
+        `_stamp_cells`); cells already in the universe are not advanced,
+        so components end up in phase with each other whatever order they
+        are placed in, and placing them one by one gives the same universe
+        as `place_many`.
+        """
+        stamp = self.compile(config_name, orientation, phase_override, inputs)
+        circuit.place(stamp.cells, origin_x, origin_y)
+        return self._instantiate(
+            stamp, config_name, origin_x, origin_y, orientation, phase_override, inputs
+        )
+
+    def place_many(self, circuit, placements):
+        """
+        Place many configurations with a single insertion into the universe.
+
+        `placements` is an iterable of dicts with the keyword arguments of
+        `place_configured` (config_name, origin_x, origin_y and optionally
+        orientation, phase_override, inputs). Returns the PlacedComponents.
+        """
+        placed = []
+        chunks = []
+        for spec in placements:
+            orientation = spec.get("orientation", 0)
+            phase_override = spec.get("phase_override")
+            inputs = spec.get("inputs")
+            stamp = self.compile(spec["config_name"], orientation, phase_override, inputs)
+            chunks.append(stamp.cells + (spec["origin_x"], spec["origin_y"]))
+            placed.append(
+                self._instantiate(
+                    stamp,
+                    spec["config_name"],
+                    spec["origin_x"],
+                    spec["origin_y"],
+                    orientation,
+                    phase_override,
+                    inputs,
+                )
+            )
+        if chunks:
+            circuit.place(np.concatenate(chunks), 0, 0)
+        return placed
+
     def apply_component_inputs(self, circuit, placed_component, inputs):
         """
         Add referenced input guns for an already placed component.
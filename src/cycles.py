@@ -0,0 +1,152 @@
+import random
+
+_MOD = (1 << 61) - 1
+
+
+class StateHash:
+    """
+    Incrementally maintained hash of a set of live cells.
+
+    Every cell (x, y) contributes the key A**x * B**y (mod 2**61 - 1) and the
+    hash is the sum of the keys of all live cells, so births and deaths
+    update it in O(1) each, Zobrist-style. Because the keys are powers,
+    translating the whole pattern by (dx, dy) multiplies the hash by
+    A**dx * B**dy; `normalized` divides out the bounding-box corner to get a
+    translation-invariant value.
+    """
+
+    def __init__(self, seed=0x5EED):
+        rng = random.Random(seed)
+        self.a = rng.randrange(2, _MOD - 1)
+        self.b = rng.randrange(2, _MOD - 1)
+        self._x_keys = {}
+        self._y_keys = {}
+        self.value = 0
+
+    def _key(self, x, y):
+        kx = self._x_keys.get(x)
+        if kx is None:
+            kx = self._x_keys[x] = pow(self.a, x, _MOD)
+        ky = self._y_keys.get(y)
+        if ky is None:
+            ky = self._y_keys[y] = pow(self.b, y, _MOD)
+        return kx * ky % _MOD
+
+    def reset(self, cells):
+        self.value = sum(self._key(x, y) for x, y in cells) % _MOD
+
+    def update(self, births, deaths):
+        value = self.value
+        for x, y in births:
+            value += self._key(x, y)
+        for x, y in deaths:
+            value -= self._key(x, y)
+        self.value = value % _MOD
+
+    def normalized(self, xmin, ymin):
+        return self.value * pow(self._key(xmin, ymin), -1, _MOD) % _MOD
+
+
+class CycleDetector:
+    """
+    Watch a Life universe for a repeated (possibly translated) state.
+
+    Each observed generation is keyed by its translation-invariant hash,
+    population and bounding-box size. A repeated key is only a candidate:
+    the state is snapshotted and, one candidate period later, compared cell
+    for cell with the snapshot shifted by the candidate displacement. Only
+    then are `period`, `displacement` (the (dx, dy) shift per period) and
+    `detected_at` set, so a hash collision can never enable skipping.
+    At most `max_history` generations are remembered.
+
+    Only the whole universe is hashed, so anything that keeps emitting
+    gliders (guns, and every gate circuit built from them) never repeats.
+    After `patience` generations without a period the detector gives up
+    (`gave_up_at`) and `watching` turns False, so Life stops paying for the
+    hash; adding cells starts the watch again. `patience=None` never gives
+    up.
+    """
+
+    def __init__(self, max_history=100_000, patience=1024):
+        self.max_history = max_history
+        self.patience = patience
+        self.hash = StateHash()
+        self.seen = {}
+        self.candidate = None
+        self.period = None
+        self.displacement = None
+        self.detected_at = None
+        self.gave_up_at = None
+        self._since = 0
+
+    @property
+    def watching(self):
+        return self.period is None and self.gave_up_at is None
+
+    def reset(self, life, keep_period=False):
+        self.seen.clear()
+        self.candidate = None
+        if not keep_period:
+            self.period = None
+            self.displacement = None
+            self.detected_at = None
+            self.gave_up_at = None
+            self._since = life.generation
+        if self.watching:
+            self.hash.reset(life._cells())
+            self.observe(life)
+
+    def update(self, births, deaths):
+        self.hash.update(births, deaths)
+
+    def _confirm(self, life):
+        period, (dx, dy), snapshot, due = self.candidate
+        if life.generation < due:
+            return
+        self.candidate = None
+        if {(x + dx, y + dy) for x, y in snapshot} == life._cells():
+            self.period = period
+            self.displacement = (dx, dy)
+            self.detected_at = life.generation
+            self.seen.clear()
+
+    def observe(self, life):
+        if not self.watching:
+            return
+        if self.candidate is not None:
+            self._confirm(life)
+            if self.period is not None:
+                return
+        elif self.patience is not None and life.generation - self._since >= self.patience:
+            self.gave_up_at = life.generation
+            self.seen.clear()
+            return
+
+        box = life.bounding_box()
+        if box is None:
+            key = (0, 0, 0, 0)
+            corner = (0, 0)
+        else:
+            xmin, xmax, ymin, ymax = box
+            key = (
+                self.hash.normalized(xmin, ymin),
+                xmax - xmin,
+                ymax - ymin,
+                life.population(),
+            )
+            corner = (xmin, ymin)
+
+        previous = self.seen.get(key)
+        if previous is not None and self.candidate is None:
+            generation, (px, py) = previous
+            period = life.generation - generation
+            self.candidate = (
+                period,
+                (corner[0] - px, corner[1] - py),
+                frozenset(life.alive),
+                life.generation + period,
+            )
+
+        if len(self.seen) >= self.max_history:
+            del self.seen[next(iter(self.seen))]
+        self.seen[key] = (life.generation, corner)
@@ -1,6 +1,15 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+import hashlib
 import importlib
+import inspect
+import json
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import re
+import sys
 import time
 
 import matplotlib.animation as mpl_animation
@@ -14,6 +23,7 @@ from circuit import Circuit, CircuitBuilder
 from components import Components
 from component_configs import COMPONENT_CONFIGS
 from life_engine import Life
+from verifier import build_gate
 import animator
 
 
@@ -32,6 +42,9 @@ class DemoContext:
     root: Path
     out_dir: Path
     comp: Components
+    # Rendered media and their final states are evicted oldest-first once
+    # they take more than this many bytes.
+    cache_limit: int = 512 * 1024 * 1024
 
 
 def create_context(root=None):
@@ -51,14 +64,71 @@ def _safe_name(name):
     return "".join(ch if ch.isalnum() else "_" for ch in name.lower()).strip("_")
 
 
-def _unique_out_path(ctx, title, suffix):
-    stamp = int(time.time() * 1000)
-    return ctx.out_dir / f"{_safe_name(title)}_{stamp}{suffix}"
-
-
-def _animate_with_reload(*args, **kwargs):
+# Cached media are named "<title>_<16 hex digits of the render key>.<ext>";
+# the timestamped files of older runs never match and are left alone.
+_CACHED_NAME = re.compile(r".+_[0-9a-f]{16}\.\w+")
+_STATE_DIR = ".render_cache"
+
+
+def _code_version(life):
+    # Source of the modules that decide what a render looks like, so editing
+    # the animator or the engine invalidates old media.
+    digest = hashlib.sha256()
+    for module in (animator, sys.modules[Life.__module__], sys.modules[type(life.engine).__module__]):
+        with open(inspect.getsourcefile(module), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _render_key(life, kind, params):
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"kind": kind, "backend": life.backend, **params}, sort_keys=True, default=repr).encode())
+    digest.update(_code_version(life).encode())
+    coords = life.coords()
+    coords = coords[np.lexsort((coords[:, 0], coords[:, 1]))]
+    digest.update(np.ascontiguousarray(coords, dtype="<i8").tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _cache_hit(path):
+    if path.exists() and path.stat().st_size > 0:
+        os.utime(path)
+        return True
+    return False
+
+
+def _prune_cache(ctx, keep=()):
+    # Drop least recently used cached media and states above ctx.cache_limit.
+    entries = [p for p in ctx.out_dir.iterdir() if p.is_file() and _CACHED_NAME.fullmatch(p.name)]
+    state_dir = ctx.out_dir / _STATE_DIR
+    if state_dir.is_dir():
+        entries.extend(p for p in state_dir.iterdir() if p.is_file())
+    stats = {}
+    for path in entries:
+        # Another render or prune may remove files under our feet.
+        try:
+            stats[path] = path.stat()
+        except FileNotFoundError:
+            continue
+    entries = list(stats)
+    total = sum(stat.st_size for stat in stats.values())
+    for path in sorted(entries, key=lambda p: stats[p].st_mtime):
+        if total <= ctx.cache_limit:
+            break
+        if path in keep:
+            continue
+        path.unlink(missing_ok=True)
+        total -= stats[path].st_size
+
+
+def _animate_with_reload(*args, renderer="matplotlib", **kwargs):
     # Keep notebook behavior stable after edits to src/animator.py.
+    # renderer="direct" skips matplotlib and encodes the cell grid itself.
     importlib.reload(animator)
+    if renderer == "direct":
+        return animator.encode_life(*args, **kwargs)
+    if renderer != "matplotlib":
+        raise ValueError("renderer must be 'matplotlib' or 'direct'")
     return animator.animate_life(*args, **kwargs)
 
 
@@ -72,23 +142,31 @@ def render_snapshot(
     show_grid=True,
     display_media=True,
     announce=True,
+    renderer="matplotlib",
+    viewport=None,
+    max_size=None,
 ):
-    out_path = _unique_out_path(ctx, title, ".png")
-    _animate_with_reload(
-        life,
-        steps=1,
-        width=width,
-        height=height,
-        save=str(out_path),
-        show_stream=show_stream,
-        show_grid=show_grid,
-        grid_spacing=20,
-        grid_alpha=0.2,
-    )
-    if (not out_path.exists()) or out_path.stat().st_size == 0:
-        raise RuntimeError(f"Snapshot was not created: {out_path}")
+    params = {
+        "width": width,
+        "height": height,
+        "viewport": viewport,
+        "max_size": max_size,
+        "show_stream": show_stream,
+        "show_grid": show_grid,
+        "grid_spacing": 20,
+        "grid_alpha": 0.2,
+    }
+    key = _render_key(life, "snapshot", {**params, "renderer": renderer})
+    out_path = ctx.out_dir / f"{_safe_name(title)}_{key}.png"
+    cached = _cache_hit(out_path)
+    if not cached:
+        _animate_with_reload(life, steps=1, save=str(out_path), renderer=renderer, **params)
+        if (not out_path.exists()) or out_path.stat().st_size == 0:
+            raise RuntimeError(f"Snapshot was not created: {out_path}")
+        _prune_cache(ctx, keep={out_path})
     if announce:
-        print(f"Snapshot: {out_path} ({out_path.stat().st_size} bytes)")
+        note = ", cached" if cached else ""
+        print(f"Snapshot: {out_path} ({out_path.stat().st_size} bytes{note})")
     if display_media:
         try:
             display(Image(filename=str(out_path)))
@@ -110,25 +188,51 @@ def render_animation(
     media_format="mp4",
     display_media=True,
     announce=True,
+    renderer="matplotlib",
+    frame_stride=1,
+    start_at=0,
+    viewport=None,
+    max_size=None,
 ):
     ext = media_format.lower().lstrip(".")
-    out_path = _unique_out_path(ctx, title, f".{ext}")
-    _animate_with_reload(
-        life,
-        steps=steps,
-        width=width,
-        height=height,
-        save=str(out_path),
-        show_stream=show_stream,
-        show_grid=show_grid,
-        speed=speed,
-        grid_spacing=20,
-        grid_alpha=0.2,
-    )
-    if (not out_path.exists()) or out_path.stat().st_size == 0:
-        raise RuntimeError(f"Animation was not created: {out_path}")
+    params = {
+        "steps": steps,
+        "frame_stride": frame_stride,
+        "start_at": start_at,
+        "width": width,
+        "height": height,
+        "viewport": viewport,
+        "max_size": max_size,
+        "show_stream": show_stream,
+        "show_grid": show_grid,
+        "speed": speed,
+        "grid_spacing": 20,
+        "grid_alpha": 0.2,
+    }
+    key = _render_key(life, "animation", {**params, "renderer": renderer, "format": ext})
+    out_path = ctx.out_dir / f"{_safe_name(title)}_{key}.{ext}"
+    # The universe after the run, so a cache hit leaves `life` where a real
+    # render would have.
+    state_path = ctx.out_dir / _STATE_DIR / f"{key}.ckpt"
+    cached = _cache_hit(out_path)
+    if cached:
+        if _cache_hit(state_path):
+            final = Life.load(state_path)
+            life.alive = ()
+            life.add(final.coords())
+            life.generation = final.generation
+        else:
+            life.advance(start_at + steps)
+    else:
+        _animate_with_reload(life, save=str(out_path), renderer=renderer, **params)
+        if (not out_path.exists()) or out_path.stat().st_size == 0:
+            raise RuntimeError(f"Animation was not created: {out_path}")
+        state_path.parent.mkdir(exist_ok=True)
+        life.save(state_path)
+        _prune_cache(ctx, keep={out_path, state_path})
     if announce:
-        print(f"Animation: {out_path} ({out_path.stat().st_size} bytes)")
+        note = ", cached" if cached else ""
+        print(f"Animation: {out_path} ({out_path.stat().st_size} bytes{note})")
     if display_media:
         if ext == "gif":
             try:
@@ -143,10 +247,48 @@ def render_animation(
     return out_path
 
 
-def run_basic_rules_demo(ctx):
+def build_pattern(comp, pattern_name, x=0, y=0, rotation=0):
+    life = Life()
+    comp.place_component(Circuit(life), pattern_name, x=x, y=y, rotation=rotation)
+    return life
+
+
+def build_reflector_gun(comp):
     life = Life()
     circuit = Circuit(life)
-    ctx.comp.place_component(circuit, "glider", x=0, y=0, rotation=0)
+    comp.place_component(circuit, "gun", x=-10, y=28, rotation=0)
+    comp.place_reflector(circuit, x=20, y=0, orientation=0)
+    return life
+
+
+def build_and_to_not(comp, inputs=None):
+    """
+    An and_gate feeding a not_gate; `inputs` for the and_gate default to
+    both on.
+    """
+    builder = CircuitBuilder(Life(), comp, cell_w=260, cell_h=260)
+    builder.add_component(
+        component_id="and1",
+        config_name="and_gate",
+        grid_x=0,
+        grid_y=0,
+        phase_override=1,
+    )
+    builder.add_component_aligned(
+        component_id="not1",
+        config_name="not_gate",
+        source_id="and1",
+        source_port="Y",
+        target_port="A",
+        distance=120,
+        phase_override=1,
+    )
+    builder.set_component_inputs("and1", {"A": True, "B": True} if inputs is None else inputs)
+    return builder
+
+
+def run_basic_rules_demo(ctx):
+    life = build_pattern(ctx.comp, "glider")
     render_snapshot(ctx, life, title="glider_t0", width=40, height=40)
     render_animation(ctx, life, title="glider_motion", steps=90, width=40, height=40)
 
@@ -165,9 +307,7 @@ def run_atomic_component_snapshots(ctx):
         ("eater", 120, 120),
         ("reflector", 180, 180),
     ]:
-        life = Life()
-        circuit = Circuit(life)
-        ctx.comp.place_component(circuit, pattern_name, x=0, y=0, rotation=0)
+        life = build_pattern(ctx.comp, pattern_name)
         render_snapshot(
             ctx,
             life,
@@ -196,9 +336,7 @@ def run_atomic_component_grid(ctx):
 
     rows = []
     for pattern_name, width, height, steps in specs:
-        life = Life()
-        circuit = Circuit(life)
-        ctx.comp.place_component(circuit, pattern_name, x=0, y=0, rotation=0)
+        life = build_pattern(ctx.comp, pattern_name)
 
         snapshot_path = render_snapshot(
             ctx,
@@ -210,9 +348,7 @@ def run_atomic_component_grid(ctx):
             announce=False,
         )
         # Build animation from a fresh initial state so each media starts at t=0.
-        life_anim = Life()
-        circuit_anim = Circuit(life_anim)
-        ctx.comp.place_component(circuit_anim, pattern_name, x=0, y=0, rotation=0)
+        life_anim = build_pattern(ctx.comp, pattern_name)
         animation_path = render_animation(
             ctx,
             life_anim,
@@ -277,10 +413,7 @@ def run_atomic_component_grid(ctx):
 
 
 def run_reflector_gun_demo(ctx):
-    life = Life()
-    circuit = Circuit(life)
-    ctx.comp.place_component(circuit, "gun", x=-10, y=28, rotation=0)
-    ctx.comp.place_reflector(circuit, x=20, y=0, orientation=0)
+    life = build_reflector_gun(ctx.comp)
     render_snapshot(ctx, life, title="reflector_gun_setup", width=100, height=100)
     render_animation(
         ctx,
@@ -293,17 +426,9 @@ def run_reflector_gun_demo(ctx):
 
 
 def demo_gate(ctx, config_name, title, inputs=None, steps=2000, width=420, height=420):
-    life = Life()
-    builder = CircuitBuilder(life, ctx.comp, cell_w=260, cell_h=260)
-    gate = builder.add_component(
-        component_id="g1",
-        config_name=config_name,
-        grid_x=0,
-        grid_y=0,
-        phase_override=1,
-    )
-    if inputs:
-        builder.set_component_inputs("g1", inputs)
+    builder = build_gate(ctx.comp, config_name, inputs)
+    life = builder.life
+    gate = builder.nodes["g1"]
 
     print(f"{title} orientation={gate.orientation}")
     for name, port in gate.ports.items():
@@ -346,32 +471,18 @@ def run_all_gate_demos(ctx):
 
 
 def run_and_to_not_demo(ctx):
-    life = Life()
-    builder = CircuitBuilder(life, ctx.comp, cell_w=260, cell_h=260)
-
-    and1 = builder.add_component(
-        component_id="and1",
-        config_name="and_gate",
-        grid_x=0,
-        grid_y=0,
-        phase_override=1,
-    )
-    not1 = builder.add_component_aligned(
-        component_id="not1",
-        config_name="not_gate",
-        source_id="and1",
-        source_port="Y",
-        target_port="A",
-        distance=120,
-        phase_override=1,
-    )
-    builder.set_component_inputs("and1", {"A": True, "B": True})
+    builder = build_and_to_not(ctx.comp)
+    life = builder.life
+    and1 = builder.nodes["and1"]
+    not1 = builder.nodes["not1"]
 
     print("and1 orientation:", and1.orientation)
     print("not1 orientation:", not1.orientation)
     print("Connections:", builder.connections)
 
-    render_snapshot(ctx, life, title="and_to_not_setup", width=920, height=680)
+    render_snapshot(ctx, life, title="and_to_not_setup", viewport="auto")
+    # Gliders leave the starting bounding box, so the animation keeps the
+    # wide window and renders it at half resolution.
     render_animation(
         ctx,
         life,
@@ -379,13 +490,15 @@ def run_and_to_not_demo(ctx):
         steps=420,
         width=920,
         height=680,
+        max_size=460,
     )
 
 
-def run_double_reflector_eater_demo(ctx):
-    life = Life()
-    builder = CircuitBuilder(life, ctx.comp, cell_w=260, cell_h=260)
-
+def build_double_reflector_eater(comp):
+    """
+    A gun whose stream is turned twice by reflectors into an eater.
+    """
+    builder = CircuitBuilder(Life(), comp, cell_w=260, cell_h=260)
     builder.add_component(
         component_id="gun1",
         config_name="glider_gun_component",
@@ -421,6 +534,12 @@ def run_double_reflector_eater_demo(ctx):
         distance=120,
         phase_override=1,
     )
+    return builder
+
+
+def run_double_reflector_eater_demo(ctx):
+    builder = build_double_reflector_eater(ctx.comp)
+    life = builder.life
 
     for component_id in ["gun1", "refl1", "refl2", "eat1"]:
         node = builder.nodes[component_id]
@@ -447,3 +566,285 @@ def run_double_reflector_eater_demo(ctx):
         width=980,
         height=760,
     )
+
+
+@dataclass
+class RenderJob:
+    """
+    One media file for `render_batch`. `build(comp)` returns the Life to
+    render (or a CircuitBuilder, whose `life` is used) and must be picklable,
+    e.g. a module-level function or a functools.partial of one. A ".png"
+    filename renders a snapshot with the render_snapshot defaults, anything
+    else an animation with the render_animation defaults.
+    """
+    group: str
+    filename: str
+    build: object
+    steps: int = 240
+    width: int = 260
+    height: int = 260
+    speed: float = 1.0
+    options: dict = field(default_factory=dict)
+
+
+def demo_render_jobs():
+    """
+    The jobs behind tests/output/demo_outputs, grouped as in manifest.json.
+    """
+    jobs = [
+        RenderJob("basic_rules", "glider_t0.png", partial(build_pattern, pattern_name="glider"), width=40, height=40),
+        RenderJob(
+            "basic_rules",
+            "glider_motion.mp4",
+            partial(build_pattern, pattern_name="glider"),
+            steps=90,
+            width=40,
+            height=40,
+        ),
+    ]
+    for pattern_name, width, height, steps in [
+        ("glider", 40, 40, 90),
+        ("gun", 120, 120, 180),
+        ("eater", 20, 20, 140),
+        ("reflector", 120, 120, 200),
+    ]:
+        build = partial(build_pattern, pattern_name=pattern_name)
+        jobs.append(
+            RenderJob(
+                "atomic_component_grid",
+                f"atomic_{pattern_name}_grid_snapshot.png",
+                build,
+                width=width,
+                height=height,
+            )
+        )
+        jobs.append(
+            RenderJob(
+                "atomic_component_grid",
+                f"atomic_{pattern_name}_grid_motion.gif",
+                build,
+                steps=steps,
+                width=width,
+                height=height,
+            )
+        )
+    jobs.append(RenderJob("reflector_gun", "reflector_gun_setup.png", build_reflector_gun, width=100, height=100))
+    jobs.append(
+        RenderJob(
+            "reflector_gun",
+            "reflector_gun_motion.mp4",
+            build_reflector_gun,
+            steps=320,
+            width=100,
+            height=100,
+        )
+    )
+    for config_name, inputs in [
+        ("not_gate", {"A": True}),
+        ("and_gate", {"A": True, "B": True}),
+        ("or_gate", {"A": True, "B": True}),
+    ]:
+        build = partial(build_gate, config_name=config_name, inputs=inputs)
+        title = f"{config_name}_demo"
+        jobs.append(RenderJob("all_gates", f"{title}_setup.png", build, width=420, height=420))
+        jobs.append(
+            RenderJob(
+                "all_gates",
+                f"{title}_motion.mp4",
+                build,
+                steps=420,
+                width=420,
+                height=420,
+                speed=3.0,
+            )
+        )
+    jobs.append(
+        RenderJob("and_to_not", "and_to_not_setup.png", build_and_to_not, options={"viewport": "auto"})
+    )
+    jobs.append(
+        RenderJob(
+            "and_to_not",
+            "and_to_not_motion.mp4",
+            build_and_to_not,
+            steps=420,
+            width=920,
+            height=680,
+            options={"max_size": 460},
+        )
+    )
+    return jobs
+
+
+def _partial_path(target, pid):
+    # Where the worker with process id `pid` renders `target` before moving
+    # it into place; same directory (so os.replace is atomic) and suffix
+    # (which picks the encoder).
+    return target.with_name(f".{target.stem}.{pid}.partial{target.suffix}")
+
+
+def _render_job(job, patterns_dir, out_dir):
+    """
+    Render one job into a partial file next to its target and move it over
+    the target only once it is complete, so a failed or killed render
+    leaves the previous media in place.
+    """
+    target = Path(out_dir) / job.filename
+    partial_path = _partial_path(target, os.getpid())
+    try:
+        size = _render_to(job, patterns_dir, partial_path)
+        os.replace(partial_path, target)
+    finally:
+        partial_path.unlink(missing_ok=True)
+    return size
+
+
+def _render_to(job, patterns_dir, target):
+    plt.switch_backend("Agg")
+    comp = Components(str(patterns_dir))
+    built = job.build(comp)
+    life = getattr(built, "life", built)
+    snapshot = target.suffix.lower() == ".png"
+    options = {
+        "show_stream": not snapshot,
+        "show_grid": True,
+        "grid_spacing": 20,
+        "grid_alpha": 0.2,
+        **job.options,
+    }
+    renderer = options.pop("renderer", "matplotlib")
+    render = animator.encode_life if renderer == "direct" else animator.animate_life
+    render(
+        life,
+        steps=1 if snapshot else job.steps,
+        width=job.width,
+        height=job.height,
+        save=str(target),
+        speed=job.speed,
+        **options,
+    )
+    if (not target.exists()) or target.stat().st_size == 0:
+        raise RuntimeError(f"render produced no output: {target}")
+    return target.stat().st_size
+
+
+def _job_worker(conn, job, patterns_dir, out_dir):
+    try:
+        conn.send(("ok", _render_job(job, patterns_dir, out_dir)))
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+
+def write_manifest(path, jobs, results):
+    """
+    Merge the jobs that rendered successfully into manifest.json. Existing
+    "steps" entries are kept as long as their file is still there (a job
+    that failed this time keeps its earlier media), new ones are appended
+    to their group, and the "attachments" list is left alone. The file is
+    replaced atomically.
+    """
+    path = Path(path)
+    manifest = {}
+    if path.exists():
+        with open(path) as f:
+            manifest = json.load(f)
+    attachments = manifest.get("attachments", [])
+    steps = {
+        group: [name for name in names if (path.parent / name).exists()]
+        for group, names in manifest.get("steps", {}).items()
+    }
+    for job in jobs:
+        if results.get(job.filename, {}).get("status") == "ok":
+            names = steps.setdefault(job.group, [])
+            if job.filename not in names:
+                names.append(job.filename)
+    steps = {group: names for group, names in steps.items() if names}
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"attachments": attachments, "steps": steps}, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def render_batch(jobs, out_dir, patterns_dir=None, processes=None, timeout=600, manifest="manifest.json"):
+    """
+    Render RenderJobs on up to `processes` worker processes (default: all
+    cores), one process per job so a job exceeding `timeout` seconds can be
+    terminated without affecting the others. A job that fails or times out
+    leaves any earlier file of the same name untouched. Returns {filename:
+    {"status": "ok" | "error" | "timeout", "seconds", "bytes" or "error"}}
+    and, unless `manifest` is None, merges the successful jobs into
+    `out_dir/manifest`.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if patterns_dir is None:
+        patterns_dir = find_project_root() / "patterns"
+    processes = processes or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+
+    pending = list(jobs)
+    running = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < processes:
+            job = pending.pop(0)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_job_worker,
+                args=(sender, job, patterns_dir, out_dir),
+                name=f"render-{job.filename}",
+                daemon=True,
+            )
+            process.start()
+            sender.close()
+            running[process.sentinel] = (process, job, receiver, time.monotonic())
+
+        now = time.monotonic()
+        next_deadline = min(started + timeout for *_, started in running.values())
+        wait(list(running), timeout=max(0.0, next_deadline - now))
+
+        now = time.monotonic()
+        for sentinel, (process, job, receiver, started) in list(running.items()):
+            seconds = round(now - started, 3)
+            if not process.is_alive():
+                process.join()
+                try:
+                    status, value = receiver.recv()
+                except EOFError:
+                    status, value = "error", f"worker exited with code {process.exitcode}"
+                key = "bytes" if status == "ok" else "error"
+                results[job.filename] = {"status": status, "seconds": seconds, key: value}
+            elif now - started >= timeout:
+                process.terminate()
+                process.join()
+                _partial_path(out_dir / job.filename, process.pid).unlink(missing_ok=True)
+                results[job.filename] = {
+                    "status": "timeout",
+                    "seconds": seconds,
+                    "error": f"exceeded {timeout}s",
+                }
+            else:
+                continue
+            receiver.close()
+            del running[sentinel]
+
+    if manifest is not None:
+        write_manifest(out_dir / manifest, jobs, results)
+    return results
+
+
+def regenerate_demo_outputs(root=None, processes=None, timeout=600):
+    """
+    Re-render every file of tests/output/demo_outputs in parallel and
+    update its manifest.json.
+    """
+    project_root = find_project_root(root)
+    return render_batch(
+        demo_render_jobs(),
+        project_root / "tests" / "output" / "demo_outputs",
+        patterns_dir=project_root / "patterns",
+        processes=processes,
+        timeout=timeout,
+    )
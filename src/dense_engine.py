@@ -0,0 +1,179 @@
+import numpy as np
+
+
+def neighbor_counts(grid):
+    """
+    Count the 8 neighbours of every cell of a 0/1 array with shifted sums
+    over its last two axes, so a (K, H, W) stack is K independent grids.
+    Cells outside the array are treated as dead.
+    """
+    n = np.zeros(grid.shape, dtype=np.uint8)
+    n[..., 1:, :] += grid[..., :-1, :]
+    n[..., :-1, :] += grid[..., 1:, :]
+    n[..., :, 1:] += grid[..., :, :-1]
+    n[..., :, :-1] += grid[..., :, 1:]
+    n[..., 1:, 1:] += grid[..., :-1, :-1]
+    n[..., 1:, :-1] += grid[..., :-1, 1:]
+    n[..., :-1, 1:] += grid[..., 1:, :-1]
+    n[..., :-1, :-1] += grid[..., 1:, 1:]
+    return n
+
+
+def next_generation(grid):
+    n = neighbor_counts(grid)
+    born_or_kept = (n == 3) | ((n == 2) & (grid != 0))
+    return born_or_kept.view(np.uint8)
+
+
+def as_coords(cells):
+    """
+    Normalize an iterable of (x, y) pairs or an (N, 2) array to int64 (N, 2).
+    """
+    if isinstance(cells, np.ndarray):
+        return cells.astype(np.int64, copy=False).reshape(-1, 2)
+    return np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+
+
+class DenseEngine:
+    """
+    Dense uint8 universe that grows whenever live cells reach its edge.
+
+    grid[y - y0, x - x0] holds the cell at world position (x, y). The outer
+    ring of the array is kept empty before every step, so cells beyond the
+    array can never be born and the shifted-sum update is exact.
+    `considered` and `profile` work as on SetEngine.
+    """
+
+    _GROW = 32
+
+    def __init__(self):
+        self.grid = np.zeros((0, 0), dtype=np.uint8)
+        self.x0 = 0
+        self.y0 = 0
+        self.track_changes = False
+        self.changes = None
+        self.considered = 0
+        self.profile = None
+
+    @property
+    def alive(self):
+        xs, ys = self.coords().T
+        return frozenset(zip(xs.tolist(), ys.tolist()))
+
+    def coords(self):
+        ys, xs = np.nonzero(self.grid)
+        return np.column_stack((xs + self.x0, ys + self.y0)).astype(np.int64)
+
+    def _fit(self, xmin, xmax, ymin, ymax):
+        # Grow the array so [xmin, xmax] x [ymin, ymax] sits at least one cell
+        # inside its edge; growth is padded so repeated small expansions are rare.
+        # Leading axes (the batch of BatchedEngine) are left alone.
+        lead = self.grid.shape[:-2]
+        h, w = self.grid.shape[-2:]
+        if h == 0:
+            pad = self._GROW
+            self.x0 = xmin - pad
+            self.y0 = ymin - pad
+            self.grid = np.zeros(
+                lead + (ymax - ymin + 1 + 2 * pad, xmax - xmin + 1 + 2 * pad), dtype=np.uint8
+            )
+            return
+
+        grow_y = max(self._GROW, h // 2)
+        grow_x = max(self._GROW, w // 2)
+        top = grow_y if ymin - 1 < self.y0 else 0
+        bottom = grow_y if ymax + 1 > self.y0 + h - 1 else 0
+        left = grow_x if xmin - 1 < self.x0 else 0
+        right = grow_x if xmax + 1 > self.x0 + w - 1 else 0
+        if top or bottom or left or right:
+            top += max(0, self.y0 - ymin)
+            bottom += max(0, ymax - (self.y0 + h - 1))
+            left += max(0, self.x0 - xmin)
+            right += max(0, xmax - (self.x0 + w - 1))
+            self.grid = np.pad(self.grid, ((0, 0),) * len(lead) + ((top, bottom), (left, right)))
+            self.x0 -= left
+            self.y0 -= top
+
+    def add(self, cells):
+        coords = as_coords(cells)
+        if len(coords) == 0:
+            return
+        xs = coords[:, 0]
+        ys = coords[:, 1]
+        self._fit(int(xs.min()), int(xs.max()), int(ys.min()), int(ys.max()))
+        self.grid[ys - self.y0, xs - self.x0] = 1
+
+    def step(self):
+        grid = self.grid
+        if grid.size == 0:
+            return
+        profile = self.profile
+        if profile is not None:
+            profile.begin()
+        if (
+            grid[..., 0, :].any()
+            or grid[..., -1, :].any()
+            or grid[..., :, 0].any()
+            or grid[..., :, -1].any()
+        ):
+            box = self.bounding_box()
+            self._fit(*box)
+        if profile is not None:
+            profile.lap("grow")
+        new = next_generation(self.grid)
+        self.considered = new.size
+        if profile is not None:
+            profile.lap("kernel")
+        if self.track_changes:
+            flipped = new ^ self.grid
+            self.changes = (
+                self._cells_of(flipped & new),
+                self._cells_of(flipped & self.grid),
+            )
+            if profile is not None:
+                profile.lap("changes")
+        self.grid = new
+
+    def _cells_of(self, mask):
+        ys, xs = np.nonzero(mask)
+        return list(zip((xs + self.x0).tolist(), (ys + self.y0).tolist()))
+
+    def population(self):
+        return int(np.count_nonzero(self.grid))
+
+    def _occupancy(self):
+        # 2D array that is non-zero wherever a cell is alive.
+        return self.grid
+
+    def bounding_box(self):
+        occupied = self._occupancy()
+        rows = np.flatnonzero(occupied.any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(occupied.any(axis=0))
+        return (
+            int(cols[0]) + self.x0,
+            int(cols[-1]) + self.x0,
+            int(rows[0]) + self.y0,
+            int(rows[-1]) + self.y0,
+        )
+
+    def _window(self, xmin, xmax, ymin, ymax):
+        h, w = self.grid.shape[-2:]
+        c0 = max(0, xmin - self.x0)
+        c1 = min(w, xmax - self.x0 + 1)
+        r0 = max(0, ymin - self.y0)
+        r1 = min(h, ymax - self.y0 + 1)
+        if c0 >= c1 or r0 >= r1:
+            return None
+        return self.grid[..., r0:r1, c0:c1]
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        window = self._window(xmin, xmax, ymin, ymax)
+        if window is None:
+            return 0
+        return int(np.count_nonzero(window))
+
+    def region_has_live(self, xmin, xmax, ymin, ymax):
+        window = self._window(xmin, xmax, ymin, ymax)
+        return window is not None and bool(window.any())
@@ -0,0 +1,322 @@
+class Node:
+    """
+    Canonical quadtree node. `a`, `b`, `c`, `d` are the (low x, low y),
+    (high x, low y), (low x, high y) and (high x, high y) quadrants; `n` is
+    the live population. Level-0 nodes are single cells.
+    """
+
+    __slots__ = ("k", "a", "b", "c", "d", "n")
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+
+
+ON = Node(0, None, None, None, None, 1)
+OFF = Node(0, None, None, None, None, 0)
+
+
+class HashLifeEngine:
+    """
+    Gosper's HashLife on a hash-consed quadtree.
+
+    Nodes are interned in `_nodes` so identical sub-patterns share one object,
+    and RESULT computations (the centre of a node advanced 2**j generations)
+    are memoized in `_results`. Between power-of-two jumps, once more than
+    `max_nodes` nodes are interned, the node table is garbage-collected down
+    to the nodes reachable from the root (plus the empty nodes) and the
+    result memo is dropped, which bounds memory on long runs without ever
+    wiping the memo in the middle of a RESULT computation.
+
+    The root covers [x0, x0 + 2**k) x [y0, y0 + 2**k).
+    """
+
+    def __init__(self, max_nodes=1 << 20):
+        self.max_nodes = max_nodes
+        self.evictions = 0
+        self._nodes = {}
+        self._results = {}
+        self._empty_nodes = [OFF]
+        self.root = self._empty(3)
+        self.x0 = 0
+        self.y0 = 0
+
+    def _join(self, a, b, c, d):
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def _collect_garbage(self):
+        if len(self._nodes) <= self.max_nodes:
+            return
+        keep = {}
+        stack = [self.root, *self._empty_nodes[1:]]
+        while stack:
+            node = stack.pop()
+            if node.k == 0:
+                continue
+            key = (node.a, node.b, node.c, node.d)
+            if key in keep:
+                continue
+            keep[key] = node
+            stack.extend(key)
+        self._nodes = keep
+        self._results.clear()
+        self.evictions += 1
+
+    def cache_size(self):
+        return len(self._nodes), len(self._results)
+
+    def _empty(self, k):
+        while len(self._empty_nodes) <= k:
+            e = self._empty_nodes[-1]
+            self._empty_nodes.append(self._join(e, e, e, e))
+        return self._empty_nodes[k]
+
+    def _centre(self, m):
+        # Embed m in the middle of a node one level larger.
+        e = self._empty(m.k - 1)
+        return self._join(
+            self._join(e, e, e, m.a),
+            self._join(e, e, m.b, e),
+            self._join(e, m.c, e, e),
+            self._join(m.d, e, e, e),
+        )
+
+    def _inner(self, m):
+        return self._join(m.a.d, m.b.c, m.c.b, m.d.a)
+
+    def _is_padded(self, m):
+        return (
+            m.a.n == m.a.d.d.n
+            and m.b.n == m.b.c.c.n
+            and m.c.n == m.c.b.b.n
+            and m.d.n == m.d.a.a.n
+        )
+
+    def _life_4x4(self, m):
+        rows = [
+            [m.a.a, m.a.b, m.b.a, m.b.b],
+            [m.a.c, m.a.d, m.b.c, m.b.d],
+            [m.c.a, m.c.b, m.d.a, m.d.b],
+            [m.c.c, m.c.d, m.d.c, m.d.d],
+        ]
+        out = []
+        for y, x in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            count = (
+                rows[y - 1][x - 1].n + rows[y - 1][x].n + rows[y - 1][x + 1].n
+                + rows[y][x - 1].n + rows[y][x + 1].n
+                + rows[y + 1][x - 1].n + rows[y + 1][x].n + rows[y + 1][x + 1].n
+            )
+            alive = count == 3 or (count == 2 and rows[y][x].n)
+            out.append(ON if alive else OFF)
+        return self._join(*out)
+
+    def _successor(self, m, j):
+        """
+        Centre of level-k node m (a level k-1 node) advanced 2**j generations,
+        with j clamped to k - 2.
+        """
+        j = min(j, m.k - 2)
+        key = (m, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if m.n == 0:
+            result = m.a
+        elif m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            a, b, c, d = m.a, m.b, m.c, m.d
+            join = self._join
+            c1 = self._successor(join(a.a, a.b, a.c, a.d), j)
+            c2 = self._successor(join(a.b, b.a, a.d, b.c), j)
+            c3 = self._successor(join(b.a, b.b, b.c, b.d), j)
+            c4 = self._successor(join(a.c, a.d, c.a, c.b), j)
+            c5 = self._successor(join(a.d, b.c, c.b, d.a), j)
+            c6 = self._successor(join(b.c, b.d, d.a, d.b), j)
+            c7 = self._successor(join(c.a, c.b, c.c, c.d), j)
+            c8 = self._successor(join(c.b, d.a, c.d, d.c), j)
+            c9 = self._successor(join(d.a, d.b, d.c, d.d), j)
+            if j < m.k - 2:
+                result = join(
+                    join(c1.d, c2.c, c4.b, c5.a),
+                    join(c2.d, c3.c, c5.b, c6.a),
+                    join(c4.d, c5.c, c7.b, c8.a),
+                    join(c5.d, c6.c, c8.b, c9.a),
+                )
+            else:
+                result = join(
+                    self._successor(join(c1, c2, c4, c5), j),
+                    self._successor(join(c2, c3, c5, c6), j),
+                    self._successor(join(c4, c5, c7, c8), j),
+                    self._successor(join(c5, c6, c8, c9), j),
+                )
+
+        self._results[key] = result
+        return result
+
+    def _advance_pow2(self, j):
+        root = self.root
+        # Pattern must sit in the central quarter and the node must be large
+        # enough that 2**j generations of light-speed growth stay inside
+        # the returned centre.
+        while root.k < j + 3 or not self._is_padded(root):
+            self.x0 -= 1 << (root.k - 1)
+            self.y0 -= 1 << (root.k - 1)
+            root = self._centre(root)
+        shift = 1 << (root.k - 2)
+        root = self._successor(root, j)
+        self.x0 += shift
+        self.y0 += shift
+        self.root = self._crop(root)
+        self._collect_garbage()
+
+    def _crop(self, root):
+        while root.k > 3:
+            inner = self._inner(root)
+            if inner.n != root.n:
+                break
+            shift = 1 << (root.k - 2)
+            self.x0 += shift
+            self.y0 += shift
+            root = inner
+        return root
+
+    def advance(self, n):
+        if self.root.n == 0:
+            return
+        while n > 0:
+            j = n.bit_length() - 1
+            self._advance_pow2(j)
+            n -= 1 << j
+
+    def step(self):
+        self.advance(1)
+
+    def _insert(self, node, x, y, cells):
+        # Set `cells` (all inside this node) live, rebuilding only the
+        # quadrants that receive new cells.
+        if not cells:
+            return node
+        if node.k == 0:
+            return ON
+        half = 1 << (node.k - 1)
+        mx = x + half
+        my = y + half
+        quads = ([], [], [], [])
+        for cx, cy in cells:
+            quads[(cx >= mx) + 2 * (cy >= my)].append((cx, cy))
+        return self._join(
+            self._insert(node.a, x, y, quads[0]),
+            self._insert(node.b, mx, y, quads[1]),
+            self._insert(node.c, x, my, quads[2]),
+            self._insert(node.d, mx, my, quads[3]),
+        )
+
+    def add(self, cells):
+        cells = [(int(x), int(y)) for x, y in cells]
+        if not cells:
+            return
+        xs, ys = zip(*cells)
+        xmin, xmax, ymin, ymax = min(xs), max(xs), min(ys), max(ys)
+        root = self.root
+        if root.n == 0:
+            # Anchor an empty universe at the new cells.
+            self.x0 = xmin
+            self.y0 = ymin
+        while (
+            xmin < self.x0 or ymin < self.y0
+            or xmax >= self.x0 + (1 << root.k) or ymax >= self.y0 + (1 << root.k)
+        ):
+            self.x0 -= 1 << (root.k - 1)
+            self.y0 -= 1 << (root.k - 1)
+            root = self._centre(root)
+        self.root = self._insert(root, self.x0, self.y0, cells)
+        self._collect_garbage()
+
+    def _collect(self, node, x, y, out):
+        if node.n == 0:
+            return
+        if node.k == 0:
+            out.add((x, y))
+            return
+        half = 1 << (node.k - 1)
+        self._collect(node.a, x, y, out)
+        self._collect(node.b, x + half, y, out)
+        self._collect(node.c, x, y + half, out)
+        self._collect(node.d, x + half, y + half, out)
+
+    @property
+    def alive(self):
+        out = set()
+        self._collect(self.root, self.x0, self.y0, out)
+        return frozenset(out)
+
+    def population(self):
+        return self.root.n
+
+    def _quadrants(self, node, x, y):
+        half = 1 << (node.k - 1)
+        return (
+            (node.a, x, y),
+            (node.b, x + half, y),
+            (node.c, x, y + half),
+            (node.d, x + half, y + half),
+        )
+
+    def _count(self, node, x, y, xmin, xmax, ymin, ymax):
+        if node.n == 0:
+            return 0
+        size = 1 << node.k
+        if x > xmax or y > ymax or x + size - 1 < xmin or y + size - 1 < ymin:
+            return 0
+        if xmin <= x and x + size - 1 <= xmax and ymin <= y and y + size - 1 <= ymax:
+            return node.n
+        return sum(
+            self._count(q, qx, qy, xmin, xmax, ymin, ymax)
+            for q, qx, qy in self._quadrants(node, x, y)
+        )
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        return self._count(self.root, self.x0, self.y0, xmin, xmax, ymin, ymax)
+
+    def region_has_live(self, xmin, xmax, ymin, ymax):
+        return self.region_count(xmin, xmax, ymin, ymax) > 0
+
+    def _extreme(self, node, x, y, axis, high):
+        if node.n == 0:
+            return None
+        if node.k == 0:
+            return (x, y)[axis]
+        a, b, c, d = self._quadrants(node, x, y)
+        near, far = ((a, c), (b, d)) if axis == 0 else ((a, b), (c, d))
+        if high:
+            near, far = far, near
+        for group in (near, far):
+            values = [
+                v for v in (self._extreme(q, qx, qy, axis, high) for q, qx, qy in group)
+                if v is not None
+            ]
+            if values:
+                return max(values) if high else min(values)
+        return None
+
+    def bounding_box(self):
+        if self.root.n == 0:
+            return None
+        args = (self.root, self.x0, self.y0)
+        return (
+            self._extreme(*args, 0, False),
+            self._extreme(*args, 0, True),
+            self._extreme(*args, 1, False),
+            self._extreme(*args, 1, True),
+        )
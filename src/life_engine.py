@@ -1,60 +1,440 @@
 import collections
+import gc
+import importlib
 
-class Life:
 
-    def __init__(self):
-        self.alive = set()
+# backend name -> (module, engine class); imported lazily so the default
+# set backend keeps working without numpy installed.
+_BACKENDS = {
+    "set": ("life_engine", "SetEngine"),
+    "numpy": ("dense_engine", "DenseEngine"),
+    "bitpacked": ("bitpacked_engine", "BitPackedEngine"),
+    "hashlife": ("hashlife", "HashLifeEngine"),
+    # Only for mostly-still patterns (eater fields, sparse debris); on the
+    # gate circuits no tile is ever idle and it runs like "set".
+    "chunked": ("chunked_engine", "ChunkedEngine"),
+}
 
-    def add(self, cells, offset=(0,0)):
-        ox, oy = offset
-        for x, y in cells:
-            self.alive.add((x+ox, y+oy))
+
+def make_engine(backend, **options):
+    if backend not in _BACKENDS:
+        raise ValueError(
+            f"unknown backend '{backend}'; expected one of: {', '.join(sorted(_BACKENDS))}"
+        )
+    module_name, class_name = _BACKENDS[backend]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)(**options)
+
+
+def _grouped(coords, cells, size):
+    # {(x // size, y // size): set of cells} for an (N, 2) int64 array and
+    # the same cells as tuples, grouped with one sort instead of a dict
+    # lookup per cell.
+    import numpy as np
+
+    keys = coords // size
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    keys = keys[order]
+    cells = [cells[i] for i in order.tolist()]
+    cut = (np.flatnonzero((keys[1:] != keys[:-1]).any(axis=1)) + 1).tolist()
+    starts = [0] + cut
+    ends = cut + [len(cells)]
+    return {
+        (kx, ky): set(cells[start:end])
+        for kx, ky, start, end in zip(keys[starts, 0].tolist(), keys[starts, 1].tolist(), starts, ends)
+    }
+
+
+class SetEngine:
+    """
+    Reference engine: the universe is a Python set of (x, y) tuples.
+    `alive` hands out a frozenset snapshot so the index below can never be
+    bypassed by editing the live set in place; it copies, so hot paths use
+    `population()` and `Life.coords()` instead.
+
+    Live cells are also bucketed into `bucket_size` x `bucket_size` squares
+    (`buckets`), kept current from each step's births and deaths, so region
+    queries and the bounding box touch only the buckets they need instead of
+    scanning every live cell.
+
+    `considered` is the number of cells the last step evaluated. When
+    `profile` is set (see step_stats.StepStats) each step reports the time
+    of its phases to it.
+    """
+
+    def __init__(self, bucket_size=16):
+        self.cells = set()
+        self.bucket_size = bucket_size
+        self.buckets = {}
+        self.track_changes = False
+        self.changes = None
+        self.considered = 0
+        self.profile = None
+
+    @property
+    def alive(self):
+        return frozenset(self.cells)
+
+    def add(self, cells):
+        fresh = set(cells) - self.cells
+        self.cells |= fresh
+        self._index_add(fresh)
+
+    def add_array(self, coords):
+        """
+        `add` for an (N, 2) integer array such as a checkpoint's. Into an
+        empty engine the tuples are built once and the buckets grouped with
+        a numpy sort.
+        """
+        import numpy as np
+
+        coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        # Millions of fresh tuples would otherwise trigger a collection
+        # every few hundred allocations, none of which can free anything.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            cells = list(zip(coords[:, 0].tolist(), coords[:, 1].tolist()))
+            if self.cells or not cells:
+                self.add(cells)
+            else:
+                self._load(coords, cells)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _load(self, coords, cells):
+        self.cells = set(cells)
+        self.buckets = _grouped(coords, cells, self.bucket_size)
+
+    def population(self):
+        return len(self.cells)
+
+    def _index_add(self, cells):
+        size = self.bucket_size
+        buckets = self.buckets
+        for cell in cells:
+            key = (cell[0] // size, cell[1] // size)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = {cell}
+            else:
+                bucket.add(cell)
+
+    def _index_remove(self, cells):
+        size = self.bucket_size
+        buckets = self.buckets
+        for cell in cells:
+            key = (cell[0] // size, cell[1] // size)
+            bucket = buckets[key]
+            bucket.discard(cell)
+            if not bucket:
+                del buckets[key]
 
     def step(self):
+        profile = self.profile
+        if profile is not None:
+            profile.begin()
         neighbor_count = collections.Counter()
 
-        for x, y in self.alive:
+        for x, y in self.cells:
             for dx in [-1,0,1]:
                 for dy in [-1,0,1]:
                     if dx != 0 or dy != 0:
                         neighbor_count[(x+dx, y+dy)] += 1
+        if profile is not None:
+            profile.lap("neighbours")
 
         new_alive = set()
 
         for cell, count in neighbor_count.items():
-            if count == 3 or (count == 2 and cell in self.alive):
+            if count == 3 or (count == 2 and cell in self.cells):
                 new_alive.add(cell)
+        self.considered = len(neighbor_count)
+        if profile is not None:
+            profile.lap("rules")
 
-        self.alive = new_alive
-
-    def run(self, steps, callback=None):
-        for t in range(steps):
-            self.step()
-            if callback:
-                callback(self, t)
-
+        births = new_alive - self.cells
+        deaths = self.cells - new_alive
+        self._index_remove(deaths)
+        self._index_add(births)
+        self.cells = new_alive
+        if self.track_changes:
+            self.changes = (births, deaths)
+        if profile is not None:
+            profile.lap("index")
 
     def bounding_box(self):
-        if not self.alive:
+        if not self.cells:
             return None
-        xs, ys = zip(*self.alive)
-        return min(xs), max(xs), min(ys), max(ys)
-    
-    def region_contains_live(self, xmin, xmax, ymin, ymax):
-        for x, y in self.alive:
-            if xmin <= x <= xmax and ymin <= y <= ymax:
-                return True
-        return False
-    
-    def region_count(self, xmin, xmax, ymin, ymax):
-        return sum(
-            1 for x, y in self.alive
-            if xmin <= x <= xmax and ymin <= y <= ymax
+        keys = self.buckets.keys()
+        return (
+            min(x for x, _ in self._bucket_cells(0, min(bx for bx, _ in keys))),
+            max(x for x, _ in self._bucket_cells(0, max(bx for bx, _ in keys))),
+            min(y for _, y in self._bucket_cells(1, min(by for _, by in keys))),
+            max(y for _, y in self._bucket_cells(1, max(by for _, by in keys))),
         )
-    
+
+    def _bucket_cells(self, axis, value):
+        for key, bucket in self.buckets.items():
+            if key[axis] == value:
+                yield from bucket
+
+    def _buckets_in(self, xmin, xmax, ymin, ymax):
+        # Yield (bucket, fully_inside) for every occupied bucket meeting the
+        # query box; walks the box or the occupied buckets, whichever is smaller.
+        size = self.bucket_size
+        bx0, bx1 = xmin // size, xmax // size
+        by0, by1 = ymin // size, ymax // size
+        if (bx1 - bx0 + 1) * (by1 - by0 + 1) <= len(self.buckets):
+            keys = (
+                (bx, by)
+                for bx in range(bx0, bx1 + 1)
+                for by in range(by0, by1 + 1)
+                if (bx, by) in self.buckets
+            )
+        else:
+            keys = (
+                (bx, by) for bx, by in self.buckets
+                if bx0 <= bx <= bx1 and by0 <= by <= by1
+            )
+        for bx, by in keys:
+            inside = (
+                xmin <= bx * size and (bx + 1) * size - 1 <= xmax
+                and ymin <= by * size and (by + 1) * size - 1 <= ymax
+            )
+            yield self.buckets[(bx, by)], inside
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        total = 0
+        for bucket, inside in self._buckets_in(xmin, xmax, ymin, ymax):
+            if inside:
+                total += len(bucket)
+            else:
+                total += sum(
+                    1 for x, y in bucket
+                    if xmin <= x <= xmax and ymin <= y <= ymax
+                )
+        return total
+
     def region_has_live(self, xmin, xmax, ymin, ymax):
         return any(
-            xmin <= x <= xmax and ymin <= y <= ymax
-            for x, y in self.alive
+            inside or any(xmin <= x <= xmax and ymin <= y <= ymax for x, y in bucket)
+            for bucket, inside in self._buckets_in(xmin, xmax, ymin, ymax)
         )
 
+
+class Life:
+    """
+    Public universe facade used by Circuit, Components and the animator.
+
+    The actual storage and stepping is delegated to a backend engine chosen
+    with `backend` ("set" for the original tuple-set engine, "numpy" for the
+    dense array engine, "bitpacked" for 64-cells-per-word rows, "hashlife"
+    for the memoized quadtree, "chunked" for the tile-skipping set engine,
+    worth it on mostly-still patterns);
+    extra keyword arguments are passed to the engine. `alive` always reads
+    back as a frozenset snapshot of (x, y) tuples; add cells through `add`
+    (or assign `alive`) so every backend sees them.
+    """
+
+    def __init__(self, backend="set", **engine_options):
+        self.backend = backend
+        self.engine_options = engine_options
+        self.engine = make_engine(backend, **engine_options)
+        self.generation = 0
+        self.cycles = None
+        self.metadata = {}
+
+    @property
+    def alive(self):
+        return self.engine.alive
+
+    @alive.setter
+    def alive(self, cells):
+        self.engine = self._new_engine()
+        self.engine.add(cells)
+        if self.cycles is not None:
+            self.cycles.reset(self)
+            self._track_changes(self.engine)
+
+    def add(self, cells, offset=(0,0)):
+        ox, oy = offset
+        if hasattr(cells, "shape"):
+            # (N, 2) coordinate arrays are shifted in one go; array engines
+            # take them as they are, the set engines bulk-load them and the
+            # others get plain int tuples.
+            cells = cells + (ox, oy)
+            if hasattr(self.engine, "coords"):
+                self.engine.add(cells)
+            elif hasattr(self.engine, "add_array"):
+                self.engine.add_array(cells)
+            else:
+                self.engine.add(zip(cells[:, 0].tolist(), cells[:, 1].tolist()))
+        else:
+            self.engine.add((x+ox, y+oy) for x, y in cells)
+        if self.cycles is not None:
+            self.cycles.reset(self)
+            self._track_changes(self.engine)
+
+    def population(self):
+        if hasattr(self.engine, "population"):
+            return self.engine.population()
+        return len(self.engine.alive)
+
+    def coords(self):
+        """
+        Live cells as an (N, 2) int64 NumPy array of (x, y) rows.
+        """
+        if hasattr(self.engine, "coords"):
+            return self.engine.coords()
+        from dense_engine import as_coords
+
+        return as_coords(self._cells())
+
+    def _cells(self):
+        # Live (x, y) cells for read-only internal use: the set engines'
+        # own set rather than the frozenset copy `alive` makes.
+        cells = getattr(self.engine, "cells", None)
+        return self.engine.alive if cells is None else cells
+
+    def save(self, path, metadata=None):
+        """
+        Write the live cells, generation and backend to a binary checkpoint
+        (see checkpoint.save_checkpoint); `metadata` defaults to `self.metadata`
+        and must be JSON-serializable.
+        """
+        from checkpoint import save_checkpoint
+
+        save_checkpoint(self, path, self.metadata if metadata is None else metadata)
+
+    @classmethod
+    def load(cls, path, backend=None, mmap=True, **engine_options):
+        """
+        Restore a universe saved with `save`. The cell array is memory-mapped
+        rather than parsed; `backend` overrides the saved one.
+        """
+        from checkpoint import load_checkpoint
+
+        return load_checkpoint(path, backend=backend, mmap=mmap, **engine_options)
+
+    def track_cycles(self, max_history=100_000, patience=1024):
+        """
+        Start hashing the state every generation and detect when it repeats,
+        possibly translated. Once a period is known, `run` (without a
+        callback) and `advance` jump over whole periods instead of simulating
+        them. Returns the CycleDetector, also available as `life.cycles`.
+
+        Only a universe that repeats as a whole has a period: a pattern
+        that emits gliders never does. The hash is dropped after `patience`
+        generations without a period (see cycles.CycleDetector), so such
+        patterns only pay for it until then.
+        """
+        from cycles import CycleDetector
+
+        self.cycles = CycleDetector(max_history=max_history, patience=patience)
+        self.cycles.reset(self)
+        self._track_changes(self.engine)
+        return self.cycles
+
+    def _watching(self):
+        return self.cycles is not None and self.cycles.watching
+
+    def _track_changes(self, engine):
+        # Births/deaths feed the cycle hash only while it is watching.
+        # StepStats (attached as `profile`) owns the flag while it records.
+        if hasattr(engine, "track_changes") and getattr(engine, "profile", None) is None:
+            engine.track_changes = self._watching()
+            if not engine.track_changes:
+                engine.changes = None
+
+    def _new_engine(self):
+        engine = make_engine(self.backend, **self.engine_options)
+        self._track_changes(engine)
+        return engine
+
+    def step(self):
+        self.engine.step()
+        self.generation += 1
+        if self._watching():
+            # Engines that report births/deaths keep the hash incremental;
+            # the others (HashLife) are rehashed.
+            changes = getattr(self.engine, "changes", None)
+            if changes is None:
+                self.cycles.hash.reset(self._cells())
+            else:
+                self.cycles.update(*changes)
+            self.cycles.observe(self)
+            if not self.cycles.watching:
+                self._track_changes(self.engine)
+
+    def _skip_cycles(self, n):
+        # state(g + k * period) is state(g) shifted by k * displacement.
+        k = n // self.cycles.period
+        if k == 0:
+            return 0
+        dx, dy = self.cycles.displacement
+        if dx or dy:
+            shifted = [(x + k * dx, y + k * dy) for x, y in self._cells()]
+            self.engine = self._new_engine()
+            self.engine.add(shifted)
+        self.generation += k * self.cycles.period
+        self.cycles.reset(self, keep_period=True)
+        return k * self.cycles.period
+
+    def advance(self, n):
+        """
+        Jump n generations ahead. Engines with a native fast-forward (HashLife)
+        skip the intermediate generations; the others fall back to stepping.
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        if self.cycles is not None and self.cycles.period:
+            n -= self._skip_cycles(n)
+        if hasattr(self.engine, "advance"):
+            self.engine.advance(n)
+            self.generation += n
+            if self.cycles is not None:
+                self.cycles.reset(self, keep_period=True)
+        else:
+            for _ in range(n):
+                self.step()
+
+    def run(self, steps, callback=None, stats=None):
+        """
+        Step `steps` generations, calling `callback(life, t)` after each.
+        A step_stats.StepStats passed as `stats` records every simulated
+        generation; generations jumped over by cycle skipping are not.
+        """
+        if stats is not None:
+            stats.attach(self)
+        try:
+            t = 0
+            while t < steps:
+                if callback is None and self.cycles is not None and self.cycles.period:
+                    t += self._skip_cycles(steps - t)
+                    if t == steps:
+                        break
+                if stats is None:
+                    self.step()
+                else:
+                    stats.step(self)
+                if callback:
+                    callback(self, t)
+                t += 1
+        finally:
+            if stats is not None:
+                stats.detach()
+
+
+    def bounding_box(self):
+        return self.engine.bounding_box()
+
+    def region_contains_live(self, xmin, xmax, ymin, ymax):
+        return self.engine.region_has_live(xmin, xmax, ymin, ymax)
+
+    def region_count(self, xmin, xmax, ymin, ymax):
+        return self.engine.region_count(xmin, xmax, ymin, ymax)
+
+    def region_has_live(self, xmin, xmax, ymin, ymax):
+        return self.engine.region_has_live(xmin, xmax, ymin, ymax)
@@ -0,0 +1,311 @@
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from bitpacked_engine import next_generation
+
+
+def _split_rows(height, workers, min_rows):
+    # One (start, stop) stripe per worker covering [0, height), each at
+    # least `min_rows` tall so halo copies stay a fraction of the work;
+    # workers left over on a short frame get empty stripes.
+    parts = max(1, min(workers, height // min_rows))
+    bounds = np.linspace(0, height, parts + 1).astype(int)
+    stripes = [(int(bounds[i]), int(bounds[i + 1])) for i in range(parts)]
+    return stripes + [(height, height)] * (workers - parts)
+
+
+def _pack(coords, margin):
+    """
+    A (rows, words) uint64 frame holding (N, 2) `coords` with at least
+    `margin` empty cells on every side, and the world (x0, y0) of its bit 0
+    of word 0 of row 0.
+    """
+    xmin, ymin = coords.min(axis=0)
+    xmax, ymax = coords.max(axis=0)
+    pad = -(-margin // 64)
+    x0 = int(xmin) - 64 * pad
+    y0 = int(ymin) - margin
+    rows = int(ymax - ymin) + 1 + 2 * margin
+    words = -(-int(xmax - xmin + 1) // 64) + 2 * pad
+    frame = np.zeros((rows, words), dtype=np.uint64)
+    xs = coords[:, 0] - x0
+    np.bitwise_or.at(
+        frame,
+        (coords[:, 1] - y0, xs // 64),
+        np.left_shift(np.uint64(1), (xs % 64).astype(np.uint64)),
+    )
+    return frame, x0, y0
+
+
+def _reframe(frame, x0, y0, margin):
+    # Cut the frame down to its live rows and words and pad it again, moving
+    # whole words only so no bits need shifting. None once nothing is alive.
+    rows = np.flatnonzero(frame.any(axis=1))
+    if len(rows) == 0:
+        return None
+    cols = np.flatnonzero(frame.any(axis=0))
+    live = frame[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1]
+    pad = -(-margin // 64)
+    out = np.zeros((live.shape[0] + 2 * margin, live.shape[1] + 2 * pad), dtype=np.uint64)
+    out[margin : margin + live.shape[0], pad : pad + live.shape[1]] = live
+    return out, x0 + 64 * (int(cols[0]) - pad), y0 + int(rows[0]) - margin
+
+
+def _unpack(frame, x0, y0):
+    bits = np.unpackbits(frame.astype("<u8").view(np.uint8), axis=1, bitorder="little")
+    ys, xs = np.nonzero(bits)
+    return np.column_stack((xs + x0, ys + y0)).astype(np.int64)
+
+
+def _near_edge(frame, reach):
+    # True if a live cell lies within `reach` cells of the frame's border,
+    # so `reach - 1` more generations could carry it onto the border.
+    if frame[:reach].any() or frame[-reach:].any():
+        return True
+    full, rest = divmod(reach, 64)
+    if full and (frame[:, :full].any() or frame[:, -full:].any()):
+        return True
+    if rest:
+        low = np.uint64((1 << rest) - 1)
+        high = np.uint64(((1 << rest) - 1) << (64 - rest))
+        return bool((frame[:, full] & low).any() or (frame[:, -full - 1] & high).any())
+    return False
+
+
+def _epochs(generations, halo):
+    # Lengths of the halo exchange periods making up `generations`.
+    return [halo] * (generations // halo) + ([generations % halo] if generations % halo else [])
+
+
+def _stripe_worker(index, conn, barrier):
+    """
+    Step stripe `index` of every frame the parent sends.
+
+    Per period of `length` generations the worker copies its rows plus
+    `length` halo rows on either side out of the shared frame, steps the
+    copy `length` times (a halo row goes stale one row per generation from
+    the outside in, so its own rows stay exact), waits until every stripe
+    has read its halos, writes its rows back and waits again. The shared
+    block stays attached until the parent sends a different one.
+    """
+    block = None
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                return
+            name, shape, stripes, epochs = task
+            if block is None or block.name != name:
+                if block is not None:
+                    block.close()
+                block = shared_memory.SharedMemory(name=name)
+            frame = np.ndarray(shape, dtype=np.uint64, buffer=block.buf)
+            try:
+                r0, r1 = stripes[index]
+                for length in epochs:
+                    if r0 < r1:
+                        lo = max(0, r0 - length)
+                        hi = min(shape[0], r1 + length)
+                        local = frame[lo:hi].copy()
+                        for _ in range(length):
+                            local = next_generation(local)
+                    barrier.wait()
+                    if r0 < r1:
+                        frame[r0:r1] = local[r0 - lo : r1 - lo]
+                    barrier.wait()
+                conn.send(("ok", None))
+            except threading.BrokenBarrierError:
+                conn.send(("error", "aborted by another worker"))
+            except Exception as exc:
+                barrier.abort()
+                conn.send(("error", f"{type(exc).__name__}: {exc}"))
+            finally:
+                del frame
+    finally:
+        if block is not None:
+            block.close()
+
+
+class StripePool:
+    """
+    `workers` processes that step the stripes of a frame in shared memory.
+
+    One pool can serve any number of `run_striped` calls; the shared block
+    is kept and only reallocated when a frame outgrows it. Close the pool
+    (or use it as a context manager) to stop the workers and free the
+    block.
+
+        with StripePool(4) as pool:
+            for _ in range(10):
+                run_striped(life, 1000, pool=pool)
+    """
+
+    def __init__(self, workers):
+        if workers < 1:
+            raise ValueError("a stripe pool needs at least one worker")
+        # Start the resource tracker before the workers so they share it;
+        # otherwise each worker's tracker reports the frames it attached to
+        # as leaked.
+        resource_tracker.ensure_running()
+        ctx = mp.get_context()
+        self.workers = workers
+        self.barrier = ctx.Barrier(workers)
+        self.block = None
+        self.conns = []
+        self.procs = []
+        for index in range(workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_stripe_worker, args=(index, child, self.barrier), daemon=True)
+            proc.start()
+            child.close()
+            self.conns.append(parent)
+            self.procs.append(proc)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _free_block(self):
+        if self.block is not None:
+            self.block.close()
+            self.block.unlink()
+            self.block = None
+
+    def load(self, frame):
+        """
+        Copy `frame` into the shared block and return the shared copy, which
+        `step` updates in place. Views returned earlier are invalid once a
+        larger frame is loaded.
+        """
+        if self.block is None or self.block.size < frame.nbytes:
+            self._free_block()
+            # Headroom so a growing pattern does not reallocate every time
+            # it is re-framed.
+            self.block = shared_memory.SharedMemory(create=True, size=max(2 * frame.nbytes, 1 << 16))
+        shared = np.ndarray(frame.shape, dtype=np.uint64, buffer=self.block.buf)
+        shared[:] = frame
+        return shared
+
+    def step(self, frame, epochs, min_rows):
+        """
+        Step `frame`, a view returned by `load`, through `epochs` in place.
+        """
+        stripes = _split_rows(frame.shape[0], self.workers, min_rows)
+        for conn in self.conns:
+            conn.send((self.block.name, frame.shape, stripes, epochs))
+        errors = []
+        pending = set(self.conns)
+        while pending:
+            ready = wait(list(pending) + [proc.sentinel for proc in self.procs], timeout=0.1)
+            for conn in pending & set(ready):
+                status, message = conn.recv()
+                if status != "ok":
+                    errors.append(message)
+                pending.discard(conn)
+            dead = [proc.exitcode for proc in self.procs if proc.exitcode is not None]
+            if dead and pending:
+                self.barrier.abort()
+                raise RuntimeError(f"striped worker exited with code {dead[0]}")
+        if errors:
+            raise RuntimeError(f"striped worker failed: {errors[0]}")
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for proc in self.procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join()
+        for conn in self.conns:
+            conn.close()
+        self.conns = []
+        self.procs = []
+        self._free_block()
+
+
+def run_striped(life, steps, workers=None, halo=8, frame_epochs=8, pool=None):
+    """
+    Advance `life` by `steps` generations on a pool of worker processes.
+
+    The live cells are packed 64 to a uint64 word (see bitpacked_engine)
+    into a frame: their bounding box plus `halo * frame_epochs + 2` empty
+    cells on every side. The frame sits in shared memory cut into one
+    horizontal stripe per worker, each at least `2 * halo` rows tall (a
+    short frame leaves some workers idle). Each worker steps its stripe
+    together with `halo` rows of its neighbours for `halo` generations,
+    after which its own rows are exact, and writes them back, so halos are
+    exchanged every `halo` generations rather than every one. Every
+    `halo * frame_epochs` generations the frame is checked; only once live
+    cells come that close to its border is it cut again around the new
+    bounding box and re-striped.
+
+    `pool` is a StripePool to run on, kept open by the caller across calls;
+    without one a pool of `workers` (default: one per CPU) is started for
+    this call. With one worker the frame is stepped in this process. On a
+    single core, or for a pattern of a few hundred cells, the process
+    overhead outweighs the split; benchmarks.py compares the runner against
+    the bitpacked engine on a large soup.
+
+    The result is bit-identical to calling `life.step()` `steps` times;
+    `life` is updated in place.
+    """
+    if steps <= 0:
+        return life
+    if halo < 1 or frame_epochs < 1:
+        raise ValueError("halo and frame_epochs must be at least 1")
+    coords = life.coords()
+    if len(coords) == 0:
+        life.generation += steps
+        return life
+
+    period = halo * frame_epochs
+    margin = period + 2
+    if pool is None:
+        workers = max(1, workers or os.cpu_count() or 1)
+        own_pool = StripePool(workers) if workers > 1 else None
+    else:
+        own_pool = None
+    active = pool or own_pool
+    frame, x0, y0 = _pack(coords, margin)
+    try:
+        if active is not None:
+            frame = active.load(frame)
+        remaining = steps
+        while remaining:
+            generations = min(remaining, period)
+            if active is None:
+                for _ in range(generations):
+                    frame = next_generation(frame)
+            else:
+                active.step(frame, _epochs(generations, halo), 2 * halo)
+            remaining -= generations
+            if remaining and _near_edge(frame, period + 1):
+                framed = _reframe(frame, x0, y0, margin)
+                if framed is None:
+                    break
+                frame, x0, y0 = framed
+                if active is not None:
+                    frame = active.load(frame)
+        cells = _unpack(frame, x0, y0)
+    finally:
+        # Drop the view before the block can be freed.
+        del frame
+        if own_pool is not None:
+            own_pool.close()
+
+    life.alive = ()
+    if len(cells):
+        life.add(cells)
+    life.generation += steps
+    return life
@@ -0,0 +1,152 @@
+import functools
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+from pattern_transform import normalize, reflect_horizontal, rotate_90, rotate_180, rotate_270
+from rle_loader import parse_rle
+
+
+CACHE_DIR_NAME = "__patterncache__"
+
+# rotation -> pattern_transform helper turning a list of (x, y) cells.
+_ROTATIONS = {
+    0: list,
+    90: rotate_90,
+    180: rotate_180,
+    270: rotate_270,
+}
+
+# Order of the (rotation, reflect) variants in a cached (8, N, 2) stack.
+SYMMETRIES = [(rotation, reflect) for reflect in (False, True) for rotation in _ROTATIONS]
+
+
+def symmetries_of(cells):
+    """
+    The eight normalized D4 variants of an (N, 2) pattern stacked as
+    (8, N, 2) in the order of `SYMMETRIES`: a reflected variant is
+    reflect_horizontal followed by the rotation, so reflect_vertical is
+    (180, True).
+    """
+    base = [(int(x), int(y)) for x, y in np.asarray(cells, dtype=np.int64).reshape(-1, 2)]
+    if not base:
+        return np.zeros((len(SYMMETRIES), 0, 2), dtype=np.int64)
+    return np.array(
+        [
+            normalize(_ROTATIONS[rotation](reflect_horizontal(base) if reflect else base))
+            for rotation, reflect in SYMMETRIES
+        ],
+        dtype=np.int64,
+    )
+
+
+class PatternCache:
+    """
+    Parsed, pre-transformed patterns stored as .npy files next to their
+    sources.
+
+    Each pattern file maps to `<cache_dir>/<stem>-<sha1>-d4.npy` holding its
+    (8, N, 2) symmetries, so an edited file gets a new entry automatically.
+    `index.json` remembers the mtime, size and hash of every source so an
+    unchanged file is not even re-hashed; a changed mtime triggers a re-hash,
+    and only a changed hash triggers a re-parse. If the cache directory
+    cannot be written the patterns are still parsed, just not stored.
+    """
+
+    def __init__(self, patterns_dir, cache_dir=None):
+        self.patterns_dir = patterns_dir
+        self.cache_dir = cache_dir or os.path.join(patterns_dir, CACHE_DIR_NAME)
+        self._index_path = os.path.join(self.cache_dir, "index.json")
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        tmp = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._index_path)
+
+    def _digest(self, path, stat):
+        index = self._load_index()
+        name = os.path.relpath(path, self.patterns_dir)
+        entry = index.get(name)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["sha1"], False
+        with open(path, "rb") as f:
+            sha1 = hashlib.sha1(f.read()).hexdigest()
+        index[name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": sha1}
+        return sha1, True
+
+    def _entry_path(self, path, sha1):
+        stem = os.path.splitext(os.path.relpath(path, self.patterns_dir))[0]
+        return os.path.join(self.cache_dir, f"{stem.replace(os.sep, '__')}-{sha1[:16]}-d4.npy")
+
+    def _store(self, entry, stacked):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            stem = os.path.basename(entry).rsplit("-", 2)[0]
+            stale_name = re.compile(re.escape(stem) + r"-[0-9a-f]{16}(-d4)?\.npy")
+            for stale in os.listdir(self.cache_dir):
+                if stale_name.fullmatch(stale):
+                    os.remove(os.path.join(self.cache_dir, stale))
+            tmp = f"{entry}.{os.getpid()}.tmp.npy"
+            np.save(tmp, stacked)
+            os.replace(tmp, entry)
+        except OSError:
+            pass
+
+    def _store_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._save_index()
+        except OSError:
+            pass
+
+    def symmetries(self, path):
+        """
+        {(rotation, reflect): normalized (N, 2) int64 cells} for the RLE at
+        `path`, covering all of `SYMMETRIES`. Memoized per process in an LRU
+        cache keyed by the file's mtime and size.
+        """
+        stat = os.stat(path)
+        stacked = _load_symmetries(
+            self.patterns_dir, self.cache_dir, os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+        )
+        return dict(zip(SYMMETRIES, stacked))
+
+    def rotations(self, path):
+        """
+        {0, 90, 180, 270} -> normalized (N, 2) int64 cells of the RLE at `path`.
+        """
+        variants = self.symmetries(path)
+        return {rotation: variants[(rotation, False)] for rotation in _ROTATIONS}
+
+    def _load(self, path):
+        stat = os.stat(path)
+        sha1, index_changed = self._digest(path, stat)
+        entry = self._entry_path(path, sha1)
+        try:
+            stacked = np.load(entry)
+        except (OSError, ValueError):
+            stacked = symmetries_of(parse_rle(path).cells)
+            self._store(entry, stacked)
+        if index_changed:
+            self._store_index()
+        stacked.flags.writeable = False
+        return stacked
+
+
+@functools.lru_cache(maxsize=256)
+def _load_symmetries(patterns_dir, cache_dir, path, mtime_ns, size):
+    return PatternCache(patterns_dir, cache_dir)._load(path)
@@ -0,0 +1,61 @@
+import os
+
+from pattern_cache import PatternCache
+
+
+class PatternRegistry:
+    """
+    Every .rle file under `patterns_dir`, by file stem, loaded on first use.
+
+    The directory tree (patterns/ and subdirectories such as premade/) is
+    only listed the first time a name is looked up, and a pattern file is
+    only read when one of its variants is requested; constructing the
+    registry touches no files. Variants are the eight D4 symmetries keyed
+    by (rotation, reflect), served from the on-disk PatternCache and its
+    in-process LRU. A top-level file wins over a same-named file in a
+    subdirectory.
+    """
+
+    def __init__(self, patterns_dir, cache=None):
+        self.patterns_dir = patterns_dir
+        self.cache = cache or PatternCache(patterns_dir)
+        self._paths = None
+
+    def _discover(self):
+        if self._paths is None:
+            paths = {}
+            for root, dirs, files in os.walk(self.patterns_dir):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(("_", ".")))
+                for filename in sorted(files):
+                    stem, ext = os.path.splitext(filename)
+                    if ext.lower() == ".rle":
+                        paths.setdefault(stem, os.path.join(root, filename))
+            self._paths = paths
+        return self._paths
+
+    def names(self):
+        return sorted(self._discover())
+
+    def __contains__(self, name):
+        return name in self._discover()
+
+    def path(self, name):
+        paths = self._discover()
+        if name not in paths:
+            raise ValueError(f"unknown pattern: {name}")
+        return paths[name]
+
+    def symmetries(self, name):
+        return self.cache.symmetries(self.path(name))
+
+    def get(self, name, rotation=0, reflect=False):
+        """
+        Normalized (N, 2) cells of `name`, mirrored by
+        pattern_transform.reflect_horizontal first if `reflect`, then
+        rotated by `rotation` degrees.
+        """
+        variants = self.symmetries(name)
+        key = (rotation, bool(reflect))
+        if key not in variants:
+            raise ValueError("rotation must be one of: 0, 90, 180, 270")
+        return variants[key]
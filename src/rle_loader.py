@@ -1,33 +1,265 @@
+import bisect
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+_HEADER = re.compile(r"^\s*x\s*=")
+_HEADER_FIELD = re.compile(r"(\w+)\s*=\s*([^,]+)")
+
+_CHUNK = 1 << 16
+_LINE_WIDTH = 70
+# Run-count prefixes for the writer; a count of 1 is written bare.
+_NUMBERS = np.array(["", ""] + [str(n) for n in range(2, 1024)], dtype="<U21")
+
+# Token kinds; any state letter other than b/. counts as alive.
+_DEAD, _ALIVE, _NEWLINE = 0, 1, 2
+
+
+@dataclass
+class RlePattern:
+    """
+    A parsed RLE file. `cells` is an (N, 2) int64 array in the same
+    convention as `load_rle`: x to the right, y = -row so the pattern grows
+    downwards from y = 0.
+    """
+    cells: np.ndarray
+    width: int = 0
+    height: int = 0
+    rule: str = "B3/S23"
+    comments: list = field(default_factory=list)
+
+
+class _RunDecoder:
+    # Turns runs of RLE tokens into cell coordinates, carrying the cursor
+    # from one chunk to the next.
+
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+        self.done = False
+        self.chunks = []
+
+    def feed(self, text):
+        # Stray non-ASCII characters (pasted comments, BOMs) are dropped.
+        chars = np.frombuffer(text.encode("ascii", errors="ignore"), dtype=np.uint8)
+        chars = chars[chars > ord(" ")]
+        tags = np.flatnonzero((chars < ord("0")) | (chars > ord("9")))
+        stop = np.flatnonzero(chars[tags] == ord("!"))
+        if len(stop):
+            self.done = True
+            tags = tags[: stop[0]]
+        if len(tags) == 0:
+            return
+
+        # Run counts: every digit adds digit * 10**(distance to its tag) to
+        # the token whose tag follows it; tokens without digits count 1.
+        body = chars[: tags[-1]]
+        digits = np.flatnonzero((body >= ord("0")) & (body <= ord("9")))
+        owner = np.searchsorted(tags, digits)
+        values = (body[digits] - ord("0")).astype(np.int64) * 10 ** (tags[owner] - 1 - digits)
+        counts = np.ones(len(tags), dtype=np.int64)
+        if len(digits):
+            numbered, first = np.unique(owner, return_index=True)
+            counts[numbered] = np.add.reduceat(values, first)
+
+        tag_chars = chars[tags]
+        kinds = np.full(len(tags), _ALIVE, dtype=np.int8)
+        kinds[(tag_chars == ord("b")) | (tag_chars == ord("."))] = _DEAD
+        kinds[tag_chars == ord("$")] = _NEWLINE
+        newline = kinds == _NEWLINE
+
+        # Row of every token: rows advanced by all earlier '$' tokens.
+        dy = np.where(newline, counts, 0)
+        rows = self.y + np.cumsum(dy) - dy
+        # Column where every token starts: run lengths summed since the last
+        # '$', or since the carried cursor if there was none yet.
+        dx = np.where(newline, 0, counts)
+        ends = np.cumsum(dx)
+        starts = ends - dx
+        last_newline = np.maximum.accumulate(
+            np.where(newline, np.arange(len(counts)), -1)
+        )
+        cols = np.where(
+            last_newline >= 0,
+            starts - ends[np.maximum(last_newline, 0)],
+            self.x + starts,
+        )
+
+        alive = kinds == _ALIVE
+        lengths = counts[alive]
+        total = int(lengths.sum())
+        if total:
+            within = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            xs = np.repeat(cols[alive], lengths) + within
+            ys = np.repeat(rows[alive], lengths)
+            self.chunks.append(np.column_stack((xs, -ys)))
+
+        self.y += int(dy.sum())
+        if last_newline[-1] >= 0:
+            self.x = int(ends[-1] - ends[last_newline[-1]])
+        else:
+            self.x += int(ends[-1])
+
+    def cells(self):
+        if not self.chunks:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.concatenate(self.chunks)
+
+
+def parse_rle(path):
+    """
+    Parse an RLE file into an RlePattern.
+
+    The body is read in chunks of about 64 KiB and each chunk is decoded
+    as a numpy byte array (run counts, rows and columns by cumulative sums),
+    so multi-megabyte patterns never go through a per-cell Python loop.
+    Bytes that are not valid UTF-8 are replaced rather than raising.
+    """
+    pattern = RlePattern(cells=None)
+    decoder = _RunDecoder()
+    pending = ""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("#"):
+                pattern.comments.append(line.rstrip("\n"))
+                continue
+            if _HEADER.match(line):
+                fields = dict(_HEADER_FIELD.findall(line))
+                pattern.width = int(fields.get("x", 0))
+                pattern.height = int(fields.get("y", 0))
+                pattern.rule = fields.get("rule", pattern.rule).strip()
+                continue
+            pending += line.strip()
+            if len(pending) >= _CHUNK:
+                # Keep a trailing run count for the next chunk.
+                cut = len(pending.rstrip("0123456789"))
+                decoder.feed(pending[:cut])
+                pending = pending[cut:]
+                if decoder.done:
+                    break
+    if not decoder.done:
+        decoder.feed(pending)
+    pattern.cells = decoder.cells()
+    return pattern
+
+
 def load_rle(path):
-    cells = []
-    x = 0
-    y = 0
-    count = ""
-
-    with open(path) as f:
-        lines = [line.strip() for line in f if not line.startswith("#")]
-
-    pattern = "".join(lines[1:])
-
-    for char in pattern:
-        if char.isdigit():
-            count += char
-        elif char == "o":
-            n = int(count) if count else 1
-            for _ in range(n):
-                cells.append((x, y))
-                x += 1
-            count = ""
-        elif char == "b":
-            n = int(count) if count else 1
-            x += n
-            count = ""
-        elif char == "$":
-            n = int(count) if count else 1
-            y += n
-            x = 0
-            count = ""
-        elif char == "!":
-            break
-
-    return [(x, -y) for x, y in cells]
+    cells = parse_rle(path).cells
+    return list(zip(cells[:, 0].tolist(), cells[:, 1].tolist()))
+
+
+def _rle_lines(rows, cols):
+    # Yield body lines of at most _LINE_WIDTH characters for cells sorted by
+    # (row, col). Run counts are computed for all runs at once; tokens are
+    # formatted _CHUNK at a time so the body text is never held whole.
+    if len(rows) == 0:
+        yield "!"
+        return
+    # A run breaks where the row changes or the column is not consecutive.
+    breaks = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 1)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(rows)]))
+    run_rows = rows[starts]
+    run_cols = cols[starts]
+    run_lengths = ends - starts
+    prev_rows = np.concatenate(([0], run_rows[:-1]))
+    prev_ends = np.concatenate(([0], run_cols[:-1] + run_lengths[:-1]))
+    new_row = run_rows != prev_rows
+
+    # Every run is "<rows>$" (on a new row), "<gap>b" and "<length>o", with
+    # zero counts dropped.
+    counts = np.column_stack(
+        (
+            run_rows - prev_rows,
+            np.where(new_row, run_cols, run_cols - prev_ends),
+            run_lengths,
+        )
+    ).ravel()
+    tags = np.tile(np.array(["$", "b", "o"]), len(run_rows))
+    keep = counts > 0
+    counts = counts[keep]
+    tags = tags[keep]
+
+    line = ""
+    for first in range(0, len(counts), _CHUNK):
+        block = counts[first : first + _CHUNK]
+        numbers = _NUMBERS[np.minimum(block, len(_NUMBERS) - 1)]
+        large = block >= len(_NUMBERS)
+        numbers[large] = block[large].astype(str)
+        text = "".join(np.char.add(numbers, tags[first : first + _CHUNK]).tolist())
+        token_ends = np.cumsum(np.char.str_len(numbers) + 1).tolist()
+        start = 0
+        while start < len(text):
+            # Longest run of whole tokens that still fits on the line.
+            last = bisect.bisect_right(token_ends, start + _LINE_WIDTH - len(line)) - 1
+            if last >= 0 and token_ends[last] > start:
+                end = token_ends[last]
+            elif line:
+                yield line
+                line = ""
+                continue
+            else:
+                # A single token wider than a line goes on its own.
+                end = token_ends[bisect.bisect_right(token_ends, start)]
+            line += text[start:end]
+            start = end
+            if start < len(text):
+                yield line
+                line = ""
+    if len(line) >= _LINE_WIDTH:
+        yield line
+        line = ""
+    yield line + "!"
+
+
+def save_rle(path, cells, region=None, rule="B3/S23", comments=()):
+    """
+    Write cells as an RLE file.
+
+    `cells` is a Life universe, an (N, 2) array or an iterable of (x, y)
+    pairs; `region` optionally keeps only the (xmin, xmax, ymin, ymax) box.
+    The top-left live cell (largest y) becomes the RLE origin, so
+    `parse_rle` reads the pattern back in the same orientation.
+    """
+    if hasattr(cells, "coords"):
+        coords = cells.coords()
+    elif hasattr(cells, "shape"):
+        coords = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    else:
+        coords = np.array(list(cells), dtype=np.int64).reshape(-1, 2)
+    if region is not None:
+        xmin, xmax, ymin, ymax = region
+        keep = (
+            (coords[:, 0] >= xmin) & (coords[:, 0] <= xmax)
+            & (coords[:, 1] >= ymin) & (coords[:, 1] <= ymax)
+        )
+        coords = coords[keep]
+
+    if len(coords):
+        x0 = int(coords[:, 0].min())
+        top = int(coords[:, 1].max())
+        cols = coords[:, 0] - x0
+        rows = top - coords[:, 1]
+        order = np.lexsort((cols, rows))
+        rows = rows[order]
+        cols = cols[order]
+        fresh = np.ones(len(rows), dtype=bool)
+        fresh[1:] = (np.diff(rows) != 0) | (np.diff(cols) != 0)
+        rows = rows[fresh]
+        cols = cols[fresh]
+        width = int(cols.max()) + 1
+        height = int(rows[-1]) + 1
+    else:
+        rows = cols = np.zeros(0, dtype=np.int64)
+        width = height = 0
+
+    with open(path, "w") as f:
+        for comment in comments:
+            f.write(comment if comment.startswith("#") else f"#C {comment}")
+            f.write("\n")
+        f.write(f"x = {width}, y = {height}, rule = {rule}\n")
+        for line in _rle_lines(rows, cols):
+            f.write(line)
+            f.write("\n")
@@ -0,0 +1,194 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+
+# Per-generation columns, in export order; -1 marks a value the engine
+# cannot report (births/deaths without change tracking, cells considered
+# by HashLife, the box of an empty universe).
+COLUMNS = (
+    "generation",
+    "seconds",
+    "population",
+    "births",
+    "deaths",
+    "bbox_width",
+    "bbox_height",
+    "considered",
+)
+
+
+class StepStats:
+    """
+    Per-generation instrumentation for `Life.run`.
+
+    Every recorded step fills one row of preallocated arrays (see COLUMNS)
+    with its wall time, population, births and deaths, bounding-box size and
+    the number of cells the engine evaluated. Engines with a `profile`
+    attribute also report the time of each phase of their step, collected
+    in `phases` as name -> per-step seconds.
+
+        stats = StepStats(420)
+        life.run(420, stats=stats)
+        stats.summary()
+        stats.to_csv("steps.csv")
+
+    `changes` turns on the engine's birth/death tracking while attached
+    (it costs a little per step); `bounding_box` can be switched off for
+    engines where the box is not cheap. Without a StepStats, engines and
+    `Life.run` only pay an `is None` check per step.
+    """
+
+    def __init__(self, steps, changes=True, bounding_box=True):
+        self.steps = steps
+        self.changes = changes
+        self.with_bounding_box = bounding_box
+        self.columns = {
+            name: np.full(steps, -1, dtype=np.float64 if name == "seconds" else np.int64)
+            for name in COLUMNS
+        }
+        self.phases = {}
+        self.samples = 0
+        self._engine = None
+        self._saved_track_changes = None
+        self._lap_start = 0.0
+
+    def __getitem__(self, name):
+        """
+        The recorded part of a column or phase.
+        """
+        if name in self.columns:
+            return self.columns[name][: self.samples]
+        if name in self.phases:
+            return self.phases[name][: self.samples]
+        raise KeyError(name)
+
+    def attach(self, life):
+        """
+        Point the engine of `life` at this collector.
+        """
+        self.detach()
+        engine = life.engine
+        if hasattr(engine, "profile"):
+            engine.profile = self
+        if self.changes and hasattr(engine, "track_changes"):
+            self._saved_track_changes = engine.track_changes
+            engine.track_changes = True
+        self._engine = engine
+
+    def detach(self):
+        """
+        Restore the engine attached last.
+        """
+        engine = self._engine
+        if engine is None:
+            return
+        if getattr(engine, "profile", None) is self:
+            engine.profile = None
+        if self._saved_track_changes is not None:
+            engine.track_changes = self._saved_track_changes
+            self._saved_track_changes = None
+        self._engine = None
+
+    # Called by the engines from inside step().
+    def begin(self):
+        self._lap_start = time.perf_counter()
+
+    def lap(self, name):
+        now = time.perf_counter()
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = np.zeros(self.steps, dtype=np.float64)
+        phase[self.samples] += now - self._lap_start
+        self._lap_start = now
+
+    def step(self, life):
+        """
+        Step `life` once and record the generation.
+        """
+        if self.samples >= self.steps:
+            raise ValueError(f"step stats are full ({self.steps} samples)")
+        if life.engine is not self._engine:
+            # Cycle skips and `alive` assignment replace the engine.
+            self.attach(life)
+        start = time.perf_counter()
+        life.step()
+        self.record(life, time.perf_counter() - start)
+
+    def record(self, life, seconds):
+        i = self.samples
+        columns = self.columns
+        engine = life.engine
+        columns["generation"][i] = life.generation
+        columns["seconds"][i] = seconds
+        columns["population"][i] = life.population()
+        changes = getattr(engine, "changes", None) if self.changes else None
+        if changes is not None:
+            births, deaths = changes
+            columns["births"][i] = len(births)
+            columns["deaths"][i] = len(deaths)
+        if self.with_bounding_box:
+            box = life.bounding_box()
+            if box is not None:
+                xmin, xmax, ymin, ymax = box
+                columns["bbox_width"][i] = xmax - xmin + 1
+                columns["bbox_height"][i] = ymax - ymin + 1
+        considered = getattr(engine, "considered", None)
+        if considered is not None:
+            columns["considered"][i] = considered
+        self.samples += 1
+
+    def summary(self):
+        """
+        Totals and means over the recorded steps, plus the share of the step
+        time spent in each engine phase.
+        """
+        seconds = self["seconds"]
+        total = float(seconds.sum())
+        result = {
+            "steps": self.samples,
+            "seconds": total,
+            "mean_step_s": total / self.samples if self.samples else 0.0,
+            "max_step_s": float(seconds.max()) if self.samples else 0.0,
+            "gens_per_sec": self.samples / total if total else 0.0,
+            "final_population": int(self["population"][-1]) if self.samples else 0,
+        }
+        for name in ("births", "deaths", "considered"):
+            values = self[name]
+            if len(values) and values.min() >= 0:
+                result[f"total_{name}"] = int(values.sum())
+        if self.phases:
+            result["phases"] = {
+                name: {
+                    "seconds": float(self[name].sum()),
+                    "share": float(self[name].sum()) / total if total else 0.0,
+                }
+                for name in self.phases
+            }
+        return result
+
+    def as_dict(self):
+        return {
+            "summary": self.summary(),
+            "columns": {name: self[name].tolist() for name in COLUMNS},
+            "phases": {name: self[name].tolist() for name in self.phases},
+        }
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=1)
+            f.write("\n")
+
+    def to_csv(self, path):
+        """
+        One row per recorded step: COLUMNS, then one "phase_<name>" column
+        per engine phase.
+        """
+        names = list(self.phases)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(list(COLUMNS) + [f"phase_{name}" for name in names])
+            data = [self[name].tolist() for name in COLUMNS] + [self[name].tolist() for name in names]
+            writer.writerows(zip(*data))
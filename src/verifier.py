@@ -0,0 +1,227 @@
+import itertools
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from functools import partial
+
+import numpy as np
+
+from batched_engine import BatchedEngine
+from circuit import CircuitBuilder
+from component_configs import COMPONENT_CONFIGS
+from components import Components
+from life_engine import Life
+from probes import ProbeMonitor
+
+
+# Expected output of the gate configurations for a tuple of input values.
+GATE_LOGIC = {
+    "and_gate": all,
+    "or_gate": any,
+    "not_gate": lambda values: not values[0],
+}
+
+
+@dataclass
+class CaseResult:
+    """
+    One input combination: `output` is whether the output region still sees
+    live cells in the last `hold` generations of the run, `latency` the
+    generation from which it saw them without a break (None for a False
+    output, so transient gliders do not count) and `trace` its live-cell
+    count after every generation.
+    """
+    inputs: dict
+    output: bool
+    latency: object
+    trace: np.ndarray = field(repr=False)
+
+
+@dataclass
+class TruthTable:
+    input_names: tuple
+    output: str
+    cases: list
+
+    def rows(self):
+        """
+        (input values, output, latency) per case, in input order.
+        """
+        return [
+            (tuple(case.inputs[name] for name in self.input_names), case.output, case.latency)
+            for case in self.cases
+        ]
+
+    def mismatches(self, logic):
+        """
+        Cases whose output differs from `logic(input values)`.
+        """
+        return [
+            case
+            for case, (values, output, _) in zip(self.cases, self.rows())
+            if output != bool(logic(values))
+        ]
+
+    def passed(self, logic):
+        return not self.mismatches(logic)
+
+    def format(self):
+        lines = [" ".join(self.input_names) + f" | {self.output} | latency"]
+        for values, output, latency in self.rows():
+            cells = " ".join(str(int(v)).rjust(len(name)) for name, v in zip(self.input_names, values))
+            lines.append(f"{cells} | {str(int(output)).rjust(len(self.output))} | {latency}")
+        return "\n".join(lines)
+
+
+def build_gate(comp, config_name, inputs=None):
+    """
+    A lone gate as node "g1" at the origin with the given inputs enabled.
+    """
+    builder = CircuitBuilder(Life(), comp, cell_w=260, cell_h=260)
+    builder.add_component(
+        component_id="g1",
+        config_name=config_name,
+        grid_x=0,
+        grid_y=0,
+        phase_override=1,
+    )
+    if inputs:
+        builder.set_component_inputs("g1", inputs)
+    return builder
+
+
+def output_region(builder, output):
+    """
+    The probe box behind "<node>.<port>": the node's region tagged with
+    that port.
+    """
+    node_id, _, port = output.partition(".")
+    if node_id not in builder.nodes:
+        raise ValueError(f"unknown component: {node_id}")
+    placed = builder.nodes[node_id]
+    if port not in placed.ports:
+        raise ValueError(f"unknown port '{port}' for component '{node_id}'")
+    for region in placed.regions.values():
+        if region.get("port") == port:
+            return region
+    raise ValueError(f"{placed.config_name} has no region for port '{port}'")
+
+
+_PATTERNS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "patterns")
+
+# Components per worker process, so cases share the parsed patterns and
+# compiled stamps.
+_COMPONENTS = {}
+
+
+def _components(patterns_dir):
+    if patterns_dir not in _COMPONENTS:
+        _COMPONENTS[patterns_dir] = Components(patterns_dir)
+    return _COMPONENTS[patterns_dir]
+
+
+def run_case(build, inputs, output, steps, hold, patterns_dir, backend=None):
+    """
+    Build one case with `build(comp, inputs=inputs)`, run it for `steps`
+    generations and read the output region every generation.
+    """
+    builder = build(_components(patterns_dir), inputs=inputs)
+    life = builder.life
+    if backend is not None and backend != life.backend:
+        life = Life(backend=backend)
+        life.add(builder.life.coords())
+    monitor = ProbeMonitor([(output, output_region(builder, output))], steps)
+    life.run(steps, callback=monitor)
+    return _case_result(inputs, monitor.trace(output), hold)
+
+
+def _case_result(inputs, trace, hold):
+    value = bool(trace[-hold:].any())
+    latency = None
+    if value:
+        # trace[i] is generation i + 1; find the last empty sample.
+        empty = np.flatnonzero(trace == 0)
+        latency = int(empty[-1]) + 2 if len(empty) else 1
+    return CaseResult(inputs=dict(inputs), output=value, latency=latency, trace=trace)
+
+
+def _run_case(args):
+    return run_case(*args)
+
+
+def run_batched(build, cases, output, steps, hold, patterns_dir):
+    """
+    Every input combination in `cases` as one universe of a BatchedEngine,
+    all stepped together; the output region is read once per generation
+    for the whole batch.
+    """
+    comp = _components(patterns_dir)
+    builders = [build(comp, inputs=inputs) for inputs in cases]
+    engine = BatchedEngine.from_lives(builder.life for builder in builders)
+    region = output_region(builders[0], output)
+    box = (region["xmin"], region["xmax"], region["ymin"], region["ymax"])
+    traces = np.zeros((steps, len(cases)), dtype=np.int32)
+    for t in range(steps):
+        engine.step()
+        traces[t] = engine.region_count(*box)
+    return [_case_result(inputs, traces[:, k], hold) for k, inputs in enumerate(cases)]
+
+
+def verify(
+    build,
+    input_names,
+    output="g1.Y",
+    steps=900,
+    hold=60,
+    patterns_dir=None,
+    processes=None,
+    backend=None,
+    batched=False,
+):
+    """
+    Run every combination of `input_names` through a netlist and tabulate
+    the output.
+
+    `build(comp, inputs=...)` returns a CircuitBuilder with the inputs
+    applied; it is sent to worker processes, so it must be picklable (a
+    module-level function or a functools.partial of one). `output` names
+    the port to read as "<node>.<port>". Cases run on a pool of
+    `processes` workers (all CPUs by default; 1 runs them in this
+    process), optionally on another `backend`. With `batched` all cases
+    are instead stepped together in this process as one BatchedEngine,
+    which assumes they share the output region. Nothing is rendered.
+    """
+    if not 0 < hold <= steps:
+        raise ValueError("hold must be between 1 and steps")
+    if patterns_dir is None:
+        patterns_dir = _PATTERNS_DIR
+    input_names = tuple(input_names)
+    if batched:
+        cases = [
+            dict(zip(input_names, values))
+            for values in itertools.product((False, True), repeat=len(input_names))
+        ]
+        cases = run_batched(build, cases, output, steps, hold, str(patterns_dir))
+        return TruthTable(input_names=input_names, output=output, cases=cases)
+    tasks = [
+        (build, dict(zip(input_names, values)), output, steps, hold, str(patterns_dir), backend)
+        for values in itertools.product((False, True), repeat=len(input_names))
+    ]
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        cases = [_run_case(task) for task in tasks]
+    else:
+        with multiprocessing.get_context().Pool(processes) as pool:
+            cases = pool.map(_run_case, tasks)
+    return TruthTable(input_names=input_names, output=output, cases=cases)
+
+
+def verify_gate(config_name, **options):
+    """
+    `verify` for one of the gate configurations, with the input ports of
+    the configuration as inputs.
+    """
+    if config_name not in COMPONENT_CONFIGS:
+        raise ValueError(f"unknown configuration: {config_name}")
+    input_names = list(COMPONENT_CONFIGS[config_name].get("input_guns", {}))
+    return verify(partial(build_gate, config_name=config_name), input_names, **options)
@@ -0,0 +1,103 @@
+import hashlib
+import os
+from functools import partial
+
+import numpy as np
+import pytest
+
+from circuit import CircuitBuilder
+from components import Components
+from demo import build_and_to_not, build_double_reflector_eater, build_pattern, build_reflector_gun
+from life_engine import Life
+from verifier import build_gate
+
+
+PATTERNS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "patterns")
+GENERATIONS = 200
+
+# Every circuit the demos ship, pinned as (population, digest of the sorted
+# cells) right after building and after GENERATIONS generations. The
+# digests match what the original step-the-world placement produced.
+DEMO_CIRCUITS = {
+    "glider": partial(build_pattern, pattern_name="glider"),
+    "gun": partial(build_pattern, pattern_name="gun"),
+    "eater": partial(build_pattern, pattern_name="eater"),
+    "reflector": partial(build_pattern, pattern_name="reflector"),
+    "reflector_gun": build_reflector_gun,
+    "not_gate": partial(build_gate, config_name="not_gate", inputs={"A": True}),
+    "and_gate": partial(build_gate, config_name="and_gate", inputs={"A": True, "B": True}),
+    "or_gate": partial(build_gate, config_name="or_gate", inputs={"A": True, "B": True}),
+    "and_to_not": build_and_to_not,
+    "double_reflector_eater": build_double_reflector_eater,
+}
+
+PINNED = {
+    "and_gate": ((108, "21b2297103470240"), (252, "ab6d2e10f1d10a6a")),
+    "and_to_not": ((144, "33cdc2b2c6f3e841"), (336, "54d20f34128fccbe")),
+    "double_reflector_eater": ((89, "f5c0194a68ecc11d"), (159, "29b16f78c80bb450")),
+    "eater": ((7, "145cb430957af736"), (7, "145cb430957af736")),
+    "glider": ((5, "d77a69158a2387a7"), (5, "f0ee235f9ab3462f")),
+    "gun": ((36, "783356911ed0e0d0"), (84, "ec14bafdd037c6b0")),
+    "not_gate": ((72, "dfc25c0a408e58ee"), (168, "aa95ef1de6285b6b")),
+    "or_gate": ((151, "fba4c9f5a2501cf9"), (343, "670aeac4fba96fe8")),
+    "reflector": ((23, "469c3da6a9ad9d43"), (34, "2252f8dd1b956d51")),
+    "reflector_gun": ((59, "07d870df2fea0253"), (118, "1330efddb42d6d9d")),
+}
+
+
+@pytest.fixture(scope="module")
+def comp():
+    return Components(PATTERNS_DIR)
+
+
+def digest(life):
+    coords = life.coords()
+    coords = coords[np.lexsort((coords[:, 1], coords[:, 0]))]
+    return life.population(), hashlib.sha256(np.ascontiguousarray(coords).tobytes()).hexdigest()[:16]
+
+
+def universe(built):
+    return getattr(built, "life", built)
+
+
+@pytest.mark.parametrize("name", sorted(DEMO_CIRCUITS))
+def test_demo_circuit_is_pinned(comp, name):
+    build = DEMO_CIRCUITS[name]
+    life = universe(build(comp))
+    assert life.generation == 0
+    built = digest(life)
+    life.advance(GENERATIONS)
+    assert (built, digest(life)) == PINNED[name]
+
+
+def test_placement_leaves_existing_components_alone(comp):
+    # A component is stamped in phase with the universe: cells already there
+    # are not stepped through its phases, so a composed build is the union
+    # of its components built on their own.
+    builder = CircuitBuilder(Life(), comp, cell_w=260, cell_h=260)
+    builder.add_component(component_id="g1", config_name="and_gate", grid_x=0, grid_y=0, phase_override=1)
+    builder.set_component_inputs("g1", {"A": True, "B": True})
+    builder.add_component(component_id="a1", config_name="annihilation_pair", grid_x=1, grid_y=0, phase_override=1)
+
+    gate = build_gate(comp, "and_gate", {"A": True, "B": True}).life
+    pair = CircuitBuilder(Life(), comp, cell_w=260, cell_h=260)
+    pair.add_component(component_id="a1", config_name="annihilation_pair", grid_x=1, grid_y=0, phase_override=1)
+    expected = gate.alive | pair.life.alive
+
+    assert builder.life.generation == 0
+    assert builder.life.alive == expected
+
+
+def test_place_many_matches_one_by_one(comp):
+    specs = [
+        {"config_name": "and_gate", "origin_x": 0, "origin_y": 0, "phase_override": 1, "inputs": {"A": True}},
+        {"config_name": "not_gate", "origin_x": 260, "origin_y": 0, "phase_override": 1, "inputs": {"A": True}},
+        {"config_name": "annihilation_pair", "origin_x": 0, "origin_y": -260, "orientation": 90},
+    ]
+    batch = Life()
+    comp.place_many(CircuitBuilder(batch, comp).circuit, specs)
+    single = Life()
+    circuit = CircuitBuilder(single, comp).circuit
+    for spec in reversed(specs):
+        comp.place_configured(circuit, **spec)
+    assert batch.alive == single.alive
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from life_engine import Life
+
+
+BACKENDS = ["numpy", "bitpacked", "hashlife", "chunked"]
+
+
+def random_soup(seed, size=48, density=0.35):
+    """
+    Random cells in a `size` x `size` square straddling the origin.
+    """
+    rng = np.random.default_rng(seed)
+    ys, xs = np.nonzero(rng.random((size, size)) < density)
+    return list(zip((xs - size // 2).tolist(), (ys - size // 3).tolist()))
+
+
+def reference(cells, steps):
+    life = Life(backend="set")
+    life.add(cells)
+    states = []
+    for _ in range(steps):
+        life.step()
+        states.append(life.alive)
+    return states
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("seed", range(5))
+def test_backend_matches_set_engine(backend, seed):
+    cells = random_soup(seed)
+    expected = reference(cells, 60)
+    life = Life(backend=backend)
+    life.add(cells)
+    for generation, state in enumerate(expected, start=1):
+        life.step()
+        assert life.alive == state, f"{backend} diverges at generation {generation}"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backend_matches_set_engine_on_wide_soup(backend):
+    # Wider than one 64-bit word and far from the origin, so the packed rows
+    # span several words and every engine has to grow.
+    cells = [(x + 1000, y - 700) for x, y in random_soup(7, size=100, density=0.25)]
+    expected = reference(cells, 20)
+    life = Life(backend=backend)
+    life.add(cells)
+    for state in expected:
+        life.step()
+        assert life.alive == state
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backend_queries_match_set_engine(backend):
+    cells = random_soup(11)
+    life = Life(backend=backend)
+    life.add(cells)
+    ref = Life(backend="set")
+    ref.add(cells)
+    life.advance(25)
+    ref.advance(25)
+    assert life.population() == ref.population()
+    assert life.bounding_box() == ref.bounding_box()
+    for box in [(-10, 10, -10, 10), (0, 0, 0, 0), (-100, -50, 3, 9)]:
+        assert life.region_count(*box) == ref.region_count(*box)
+        assert life.region_has_live(*box) == ref.region_has_live(*box)
+
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+# Gosper glider gun: the universe never repeats as a whole.
+GUN = [
+    (0, 4), (0, 5), (1, 4), (1, 5), (10, 4), (10, 5), (10, 6), (11, 3), (11, 7),
+    (12, 2), (12, 8), (13, 2), (13, 8), (14, 5), (15, 3), (15, 7), (16, 4),
+    (16, 5), (16, 6), (17, 5), (20, 2), (20, 3), (20, 4), (21, 2), (21, 3),
+    (21, 4), (22, 1), (22, 5), (24, 0), (24, 1), (24, 5), (24, 6), (34, 2),
+    (34, 3), (35, 2), (35, 3),
+]
+
+
+@pytest.mark.parametrize("backend", ["set"] + BACKENDS)
+def test_cycle_skipping_matches_stepping(backend):
+    life = Life(backend=backend)
+    life.add(GLIDER)
+    cycles = life.track_cycles()
+    life.run(1000)
+    assert (cycles.period, cycles.displacement) == (4, (1, 1))
+    assert life.alive == frozenset((x + 250, y + 250) for x, y in GLIDER)
+
+
+def test_cycle_tracking_gives_up_on_emitting_patterns():
+    life = Life(backend="numpy")
+    life.add(GUN)
+    cycles = life.track_cycles(patience=200)
+    life.run(300)
+    assert cycles.period is None and cycles.gave_up_at == 200
+    assert not life.engine.track_changes
+    life.add([(-50, -50), (-49, -50), (-48, -50)])
+    assert cycles.watching and life.engine.track_changes
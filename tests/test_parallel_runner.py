@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+from components import Components
+from demo import build_and_to_not
+from life_engine import Life
+from parallel_runner import StripePool, _split_rows, run_striped
+
+
+PATTERNS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "patterns")
+
+
+def soup(seed, width, height, density=0.3):
+    rng = np.random.default_rng(seed)
+    ys, xs = np.nonzero(rng.random((height, width)) < density)
+    return np.column_stack((xs, ys))
+
+
+def stepped(cells, steps, backend="set"):
+    life = Life(backend=backend)
+    life.add(cells)
+    life.advance(steps)
+    return life
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+@pytest.mark.parametrize("steps", [1, 13, 90])
+def test_striped_matches_life_step(workers, steps):
+    # Small halo and frame periods so the run crosses several halo
+    # exchanges and re-framings, ending part-way through one.
+    cells = soup(1, 70, 90) + (-30, 500)
+    life = Life()
+    life.add(cells)
+    run_striped(life, steps, workers=workers, halo=4, frame_epochs=3)
+    assert life.generation == steps
+    assert life.alive == stepped(cells, steps).alive
+
+
+def test_striped_matches_life_step_on_circuit():
+    cells = build_and_to_not(Components(PATTERNS_DIR)).life.coords()
+    life = Life()
+    life.add(cells)
+    run_striped(life, 300, workers=2)
+    assert life.alive == stepped(cells, 300).alive
+
+
+@pytest.mark.parametrize("cells", [[], [(0, 0), (5, 5)]])
+def test_striped_empty_and_dying(cells):
+    life = Life()
+    life.add(cells)
+    run_striped(life, 40, workers=2)
+    assert life.population() == 0
+    assert life.generation == 40
+
+
+def test_striped_pool_is_reused_across_calls():
+    cells = soup(2, 40, 200)
+    life = Life()
+    life.add(cells)
+    with StripePool(3) as pool:
+        run_striped(life, 30, halo=4, frame_epochs=2, pool=pool)
+        block = pool.block
+        run_striped(life, 30, halo=4, frame_epochs=2, pool=pool)
+        assert pool.block is block
+    assert pool.block is None
+    assert life.alive == stepped(cells, 60).alive
+
+
+def test_stripes_keep_a_minimum_height():
+    assert _split_rows(100, 4, 16) == [(0, 25), (25, 50), (50, 75), (75, 100)]
+    assert _split_rows(40, 4, 16) == [(0, 20), (20, 40), (40, 40), (40, 40)]
+    assert _split_rows(10, 3, 16) == [(0, 10), (10, 10), (10, 10)]